@@ -5,7 +5,7 @@ Create split directories from project-manifest.md.
 Parses the SPLIT_MANIFEST block and creates the corresponding directories.
 
 Usage:
-    uv run create-split-dirs.py --planning-dir <path>
+    uv run create-split-dirs.py --planning-dir <path> [--pretty]
 
 Output (JSON):
     {
@@ -18,68 +18,68 @@ Output (JSON):
 """
 
 import argparse
-import json
 import sys
 from pathlib import Path
+from typing import Any
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from lib.config import SessionFilename
-from lib.manifest import parse_manifest
+from lib.manifest import create_split_dirs, load_manifest
+from lib.output import emit_json
 
 
-def main() -> int:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Create split directories from manifest")
     parser.add_argument("--planning-dir", required=True, help="Path to planning directory")
-    args = parser.parse_args()
+    parser.add_argument("--pretty", action="store_true", help="Indent JSON output for debugging")
+    return parser
+
 
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Create the split directories and return the JSON-ready result.
+
+    Does no output of its own, so tests can call it in-process.
+    """
     planning_dir = Path(args.planning_dir).resolve()
 
     if not planning_dir.exists():
-        print(json.dumps({
+        return {
             "success": False,
             "error": f"Planning directory not found: {planning_dir}"
-        }, indent=2))
-        return 1
+        }
 
     if not planning_dir.is_dir():
-        print(json.dumps({
+        return {
             "success": False,
             "error": f"Expected directory, got file: {planning_dir}"
-        }, indent=2))
-        return 1
+        }
 
-    # Parse manifest
-    manifest_path = planning_dir / SessionFilename.MANIFEST
-    result = parse_manifest(manifest_path)
+    # Parse manifest (or reuse splits recorded by setup-session.py)
+    result = load_manifest(planning_dir)
 
     if not result.is_valid:
-        print(json.dumps({
+        return {
             "success": False,
             "error": "Manifest validation failed",
             "errors": result.errors
-        }, indent=2))
-        return 1
+        }
 
     # Create directories
-    created: list[str] = []
-    skipped: list[str] = []
-
-    for split_name in result.splits:
-        split_dir = planning_dir / split_name
-        if split_dir.exists():
-            skipped.append(split_name)
-        else:
-            split_dir.mkdir(parents=False, exist_ok=False)
-            created.append(split_name)
-
-    print(json.dumps({
+    created, skipped = create_split_dirs(planning_dir, result.splits)
+
+    return {
         "success": True,
         "created": created,
         "skipped": skipped,
         "manifest_splits": result.splits,
         "message": f"Created {len(created)} directories, skipped {len(skipped)} existing"
-    }, indent=2))
-    return 0
+    }
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    result = run(args)
+    emit_json(result, pretty=args.pretty)
+    return 0 if result["success"] else 1
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@
 Setup and manage /deep-project session state.
 
 Usage:
-    uv run setup-session.py --file <path_to_spec.md> --plugin-root <path> [--session-id <id>] [--force]
+    uv run setup-session.py --file <path_to_spec.md> --plugin-root <path> [--session-id <id>] [--force] [--pretty] [--preallocate-fds]
 
 Output (JSON):
     {
@@ -17,6 +17,8 @@ Output (JSON):
         "state": { ... },
         "split_directories": ["/path/to/planning/01-name", ...],
         "splits_needing_specs": ["02-name", ...],
+        "manifest_splits": ["01-name", "02-name", ...],
+        "splits_needing_dirs": ["02-name", ...],
         "warnings": [...],
         "tasks_written": <count>,
         "task_list_id": "<session_id>",
@@ -26,56 +28,115 @@ Output (JSON):
 """
 
 import argparse
+import errno
+import heapq
 import json
+import os
+import stat
 import sys
-from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, TypedDict
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from lib.config import (
-    check_input_file_changed,
     create_initial_session_state,
+    input_file_status,
     load_session_state,
     save_session_state,
-    session_state_exists,
+    update_session_state,
 )
+from lib.manifest import manifest_status
+from lib.output import emit_json
 from lib.state import detect_state
 from lib.task_reconciliation import TaskListContext, TaskListSource
 from lib.task_storage import get_tasks_dir, write_tasks
 from lib.tasks import (
+    SEMANTIC_TO_POSITION,
     TASK_DEPENDENCIES,
     build_dependency_graph,
-    build_semantic_to_position_map,
     generate_expected_tasks,
 )
 
 
 def validate_input_file(file_path: str) -> tuple[bool, str]:
-    """Validate that input file exists, is readable, has content."""
-    path = Path(file_path)
+    """Validate that input file exists, is readable, has content.
 
-    if not path.exists():
+    Opens the file once and answers the remaining checks from that fd
+    (fstat for type and size, read for content). The open is non-blocking
+    so a FIFO is rejected instead of waiting for a writer.
+    """
+    try:
+        fd = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+    except (FileNotFoundError, NotADirectoryError):
         return False, f"File not found: {file_path}"
-
-    if not path.is_file():
+    except IsADirectoryError:
         return False, f"Expected a file, got directory: {file_path}"
-
-    if not path.suffix == ".md":
-        return False, f"Expected markdown file (.md), got: {path.suffix}"
-
-    try:
-        content = path.read_text()
-        if not content.strip():
-            return False, f"File is empty: {file_path}"
     except PermissionError:
         return False, f"Cannot read file (permission denied): {file_path}"
+    except OSError as e:
+        if e.errno != errno.ELOOP:
+            raise
+        return False, f"File not found: {file_path}"
     # Let other exceptions propagate for debugging (per CLAUDE.md)
 
+    try:
+        st = os.fstat(fd)
+        if stat.S_ISDIR(st.st_mode):
+            return False, f"Expected a file, got directory: {file_path}"
+        if not stat.S_ISREG(st.st_mode):
+            return False, f"Expected a regular file: {file_path}"
+
+        suffix = os.path.splitext(file_path)[1]
+        if not suffix == ".md":
+            return False, f"Expected markdown file (.md), got: {suffix}"
+
+        if st.st_size == 0 or not _has_content(fd):
+            return False, f"File is empty: {file_path}"
+    finally:
+        os.close(fd)
+
     return True, ""
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
-class ConflictInfo:
+def _has_content(fd: int) -> bool:
+    """Return True once a non-whitespace byte is read from fd."""
+    while chunk := os.read(fd, 65536):
+        if chunk.strip():
+            return True
+    return False
+
+
+# Highest fd that fits under the common default RLIMIT_NOFILE of 1024
+PREALLOCATED_FD = 1023
+
+
+def preallocate_fd_table(high_fd: int = PREALLOCATED_FD) -> None:
+    """Grow the process fd table once, before task files are opened.
+
+    Duplicating a descriptor onto a high fd number makes the kernel size
+    the fd table for it up front; the table does not shrink when that fd
+    is closed again, so later opens never trigger a resize. F_DUPFD takes
+    the lowest free fd at or above high_fd, so a descriptor already open
+    there is left alone. Failures (e.g. a lower fd limit, or no fcntl on
+    this platform) are ignored since this is only an optimization.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return
+    try:
+        placeholder = os.open(os.devnull, os.O_RDONLY | os.O_CLOEXEC)
+    except OSError:
+        return
+    try:
+        os.close(fcntl.fcntl(placeholder, fcntl.F_DUPFD, high_fd))
+    except OSError:
+        pass
+    finally:
+        os.close(placeholder)
+
+
+class ConflictInfo(TypedDict):
     """Information about conflicting existing tasks."""
 
     task_list_id: str
@@ -103,32 +164,38 @@ def check_for_conflict(
         return None  # Session-based = no conflict, just resume
 
     tasks_dir = get_tasks_dir(task_list_id)
-    if not tasks_dir.exists():
+
+    # One directory pass gives the count; samples are the 3 lowest names
+    # (heapq.nsmallest), so no full sort is needed
+    try:
+        with os.scandir(tasks_dir) as entries:
+            task_names = [e.name for e in entries if e.name.endswith(".json")]
+    except FileNotFoundError:
         return None
 
-    task_files = list(tasks_dir.glob("*.json"))
-    if not task_files:
+    if not task_names:
         return None
 
     # Has existing tasks - collect sample subjects
     sample_subjects = []
-    for task_file in sorted(task_files)[:3]:
+    for name in heapq.nsmallest(3, task_names):
         try:
-            data = json.loads(task_file.read_text())
+            with open(tasks_dir / name, "rb") as f:
+                data = json.loads(f.read())
             subject = data.get("subject", "")
             if subject and subject != "[obsolete]":
                 sample_subjects.append(subject)
         except (json.JSONDecodeError, OSError):
             continue
 
-    return ConflictInfo(
-        task_list_id=task_list_id,
-        existing_task_count=len(task_files),
-        sample_subjects=sample_subjects,
-    )
+    return {
+        "task_list_id": task_list_id,
+        "existing_task_count": len(task_names),
+        "sample_subjects": sample_subjects,
+    }
 
 
-def main() -> int:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Setup /deep-project session")
     parser.add_argument("--file", required=True, help="Path to requirements .md file")
     parser.add_argument("--plugin-root", required=True, help="Path to plugin root")
@@ -141,36 +208,60 @@ def main() -> int:
         action="store_true",
         help="Overwrite existing tasks in user-specified task list",
     )
-    args = parser.parse_args()
+    parser.add_argument("--pretty", action="store_true", help="Indent JSON output for debugging")
+    parser.add_argument(
+        "--preallocate-fds",
+        action="store_true",
+        help="Grow the fd table up front before opening task files",
+    )
+    return parser
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Set up or resume the session and return the JSON-ready result.
+
+    Does no output of its own, so tests can call it in-process.
+    """
+
+    if args.preallocate_fds:
+        preallocate_fd_table()
 
     # Validate input file
     valid, error = validate_input_file(args.file)
     if not valid:
-        print(json.dumps({
+        return {
             "success": False,
             "error": error
-        }, indent=2))
-        return 1
+        }
 
     # Determine planning directory (parent of input file)
     input_path = Path(args.file).resolve()
     planning_dir = input_path.parent
 
-    # Check if session state already exists
-    is_new_session = not session_state_exists(planning_dir)
+    # Load session state once; later checks reuse it
+    session_state = load_session_state(planning_dir)
+    is_new_session = session_state is None
 
     # Create initial session state for new sessions
     if is_new_session:
-        initial_state = create_initial_session_state(str(input_path))
-        save_session_state(planning_dir, initial_state)
+        session_state = create_initial_session_state(str(input_path))
+        save_session_state(planning_dir, session_state)
 
     # Check if input file changed since session start
     warnings: list[str] = []
-    file_changed = check_input_file_changed(planning_dir, input_path)
+    file_changed, input_stat = input_file_status(planning_dir, input_path, session_state)
     if file_changed:
         warnings.append(
             f"Input file has changed since session started: {input_path}"
         )
+    elif any(session_state.get(k) != v for k, v in input_stat.items()):
+        # Content is unchanged; record the current stat so the next run
+        # can skip hashing. This is only a cache, so a read-only planning
+        # dir is not an error.
+        try:
+            update_session_state(planning_dir, **input_stat)
+        except OSError:
+            pass
 
     # Detect current state
     state = detect_state(planning_dir)
@@ -181,7 +272,7 @@ def main() -> int:
         resume_from_step = 1  # Start at interview
     else:
         mode = "resume"
-        resume_from_step = state["resume_step"]
+        resume_from_step = state.resume_step
 
     # Get task list context from args and environment
     task_context = TaskListContext.from_args_and_env(context_session_id=args.session_id)
@@ -193,36 +284,22 @@ def main() -> int:
             task_context.is_user_specified,
         )
         if conflict:
-            print(
-                json.dumps(
-                    {
-                        "success": False,
-                        "mode": "conflict",
-                        "error": "Existing tasks found in user-specified task list",
-                        "task_list_id": conflict.task_list_id,
-                        "existing_task_count": conflict.existing_task_count,
-                        "sample_subjects": conflict.sample_subjects,
-                        "hint": "Re-run with --force to overwrite existing tasks",
-                    },
-                    indent=2,
-                )
-            )
-            return 1
+            return {
+                "success": False,
+                "mode": "conflict",
+                "error": "Existing tasks found in user-specified task list",
+                **conflict,
+                "hint": "Re-run with --force to overwrite existing tasks",
+            }
 
     # Check if we have a task list ID
     if not task_context.task_list_id:
-        print(
-            json.dumps(
-                {
-                    "success": False,
-                    "mode": "no_task_list",
-                    "error": "No session ID available. SessionStart hook may not have run.",
-                    "hint": "Restart the Claude Code session to trigger the hook.",
-                },
-                indent=2,
-            )
-        )
-        return 1
+        return {
+            "success": False,
+            "mode": "no_task_list",
+            "error": "No session ID available. SessionStart hook may not have run.",
+            "hint": "Restart the Claude Code session to trigger the hook.",
+        }
 
     # Generate expected tasks based on workflow state
     tasks_to_write = generate_expected_tasks(
@@ -233,11 +310,10 @@ def main() -> int:
     )
 
     # Build dependency graph
-    semantic_to_position = build_semantic_to_position_map()
     dependency_graph = build_dependency_graph(
         tasks_to_write,
         TASK_DEPENDENCIES,
-        semantic_to_position,
+        SEMANTIC_TO_POSITION,
     )
 
     # Write tasks directly to disk
@@ -248,11 +324,27 @@ def main() -> int:
     )
 
     # Compute split directories (full paths) and which need specs
-    splits = state.get("splits", [])
-    splits_with_specs = state.get("splits_with_specs", [])
+    splits = state.splits
+    splits_with_specs = state.splits_with_specs
     split_directories = [str(planning_dir / s) for s in splits]
     splits_needing_specs = [s for s in splits if s not in splits_with_specs]
 
+    # Splits listed in a valid manifest but not yet created. Directories
+    # are only created by create-split-dirs.py after user confirmation.
+    manifest_splits: list[str] = []
+    if state.manifest_created:
+        manifest, manifest_fields = manifest_status(planning_dir, session_state)
+        if manifest.is_valid:
+            manifest_splits = manifest.splits
+        if manifest_fields:
+            # Record the parsed splits so later runs skip parsing; like the
+            # input stat above, this is only a cache.
+            try:
+                update_session_state(planning_dir, **manifest_fields)
+            except OSError:
+                pass
+    splits_needing_dirs = [s for s in manifest_splits if s not in splits]
+
     result = {
         "success": True,
         "mode": mode,
@@ -260,9 +352,11 @@ def main() -> int:
         "initial_file": str(input_path),
         "plugin_root": args.plugin_root,
         "resume_from_step": resume_from_step,
-        "state": state,
+        "state": state.to_dict(),
         "split_directories": split_directories,
         "splits_needing_specs": splits_needing_specs,
+        "manifest_splits": manifest_splits,
+        "splits_needing_dirs": splits_needing_dirs,
         "warnings": warnings,
         "message": f"{'Starting new' if mode == 'new' else 'Resuming'} session in: {planning_dir}",
         # New task system fields
@@ -276,8 +370,14 @@ def main() -> int:
     if not write_result.success:
         result["task_write_error"] = write_result.error
 
-    print(json.dumps(result, indent=2))
-    return 0
+    return result
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    result = run(args)
+    emit_json(result, pretty=args.pretty)
+    return 0 if result["success"] else 1
 
 
 if __name__ == "__main__":
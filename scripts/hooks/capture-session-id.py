@@ -9,26 +9,62 @@ This hook reads session_id from the JSON payload on stdin and:
 from __future__ import annotations
 
 import json
+import mmap
 import os
 import sys
+from collections.abc import Mapping
 
 
-def main() -> int:
+def find_existing(env_file: str, assignments: list[str]) -> set[str]:
+    """Return the assignments already present in env_file.
+
+    Searches a read-only memory map of the file instead of reading it
+    into a string. A missing or empty file contains nothing.
+    """
+    try:
+        fd = os.open(env_file, os.O_RDONLY)
+    except FileNotFoundError:
+        return set()
+    try:
+        if os.fstat(fd).st_size == 0:
+            return set()  # mmap rejects empty files
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            return {
+                assignment
+                for assignment in assignments
+                if mm.find(assignment.encode("utf-8")) != -1
+            }
+    finally:
+        os.close(fd)
+
+
+def run(stdin_bytes: bytes, env: Mapping[str, str]) -> tuple[int, str, str]:
+    """Run the hook against an explicit payload and environment.
+
+    Args:
+        stdin_bytes: Raw JSON payload, as the hook receives it on stdin
+        env: Environment to read DEEP_SESSION_ID and CLAUDE_ENV_FILE from
+
+    Returns:
+        Tuple of (exit code, stdout text, stderr text)
+    """
     try:
-        payload = json.load(sys.stdin)
+        payload = json.loads(stdin_bytes)
     except json.JSONDecodeError:
-        return 0  # Hooks should never fail
+        return 0, "", ""  # Hooks should never fail
     except Exception:
-        return 0
+        return 0, "", ""
 
     session_id = payload.get("session_id")
     transcript_path = payload.get("transcript_path")
 
     if not session_id:
-        return 0
+        return 0, "", ""
+
+    stdout = ""
 
     # Check if DEEP_SESSION_ID is already set correctly
-    existing_session_id = os.environ.get("DEEP_SESSION_ID")
+    existing_session_id = env.get("DEEP_SESSION_ID")
     if existing_session_id != session_id:
         # Not set or doesn't match - output to Claude's context via additionalContext
         output = {
@@ -37,37 +73,48 @@ def main() -> int:
                 "additionalContext": f"DEEP_SESSION_ID={session_id}",
             }
         }
-        print(json.dumps(output))
+        stdout = json.dumps(output) + "\n"
 
     # SECONDARY: Also try CLAUDE_ENV_FILE for bash commands (may not work)
-    env_file = os.environ.get("CLAUDE_ENV_FILE")
+    env_file = env.get("CLAUDE_ENV_FILE")
     if env_file:
         try:
-            existing_content = ""
-            try:
-                with open(env_file) as f:
-                    existing_content = f.read()
-            except FileNotFoundError:
-                pass
-
-            lines_to_write = []
-            if f"DEEP_SESSION_ID={session_id}" not in existing_content:
-                lines_to_write.append(f"export DEEP_SESSION_ID={session_id}\n")
-            if (
-                transcript_path
-                and f"CLAUDE_TRANSCRIPT_PATH={transcript_path}" not in existing_content
-            ):
-                lines_to_write.append(
-                    f"export CLAUDE_TRANSCRIPT_PATH={transcript_path}\n"
-                )
+            assignments = [f"DEEP_SESSION_ID={session_id}"]
+            if transcript_path:
+                assignments.append(f"CLAUDE_TRANSCRIPT_PATH={transcript_path}")
+
+            present = find_existing(env_file, assignments)
+            lines_to_write = "".join(
+                f"export {assignment}\n"
+                for assignment in assignments
+                if assignment not in present
+            )
 
             if lines_to_write:
-                with open(env_file, "a") as f:
-                    f.writelines(lines_to_write)
+                # O_APPEND: concurrent hooks cannot interleave within one write
+                fd = os.open(env_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, lines_to_write.encode("utf-8"))
+                finally:
+                    os.close(fd)
         except OSError:
             pass  # CLAUDE_ENV_FILE failed, but we already output to context
 
-    return 0
+    return 0, stdout, ""
+
+
+def main() -> int:
+    try:
+        stdin_bytes = sys.stdin.buffer.read()
+    except Exception:
+        return 0  # Hooks should never fail
+
+    returncode, stdout, stderr = run(stdin_bytes, os.environ)
+    if stdout:
+        sys.stdout.buffer.write(stdout.encode("ascii"))
+    if stderr:
+        sys.stderr.write(stderr)
+    return returncode
 
 
 if __name__ == "__main__":
@@ -4,7 +4,10 @@ Design principle: Files are checkpoints, JSON is minimal.
 
 The session.json stores only:
 - input_file_hash: Detect if requirements changed
+- input_file_mtime_ns, input_file_size: Skip rehashing an untouched file
 - session_created_at: When session started
+- manifest_splits, manifest_mtime_ns, manifest_size: Parsed manifest
+  splits, reused while the manifest file is unchanged
 
 Everything else is derived from file existence:
 - Interview complete: deep_project_interview.md exists
@@ -13,17 +16,20 @@ Everything else is derived from file existence:
 - Specs written: spec.md in each directory
 """
 
-import fcntl
+import functools
 import hashlib
 import json
 import os
 import tempfile
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from enum import StrEnum
 from pathlib import Path
 from typing import Any, Self
 
+from .output import dumps_json
+
 
 class SessionFilename(StrEnum):
     """Session file names for deep-project."""
@@ -47,6 +53,8 @@ class SessionState:
 
     input_file_hash: str
     session_created_at: str
+    input_file_mtime_ns: int | None = None
+    input_file_size: int | None = None
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Self:
@@ -57,6 +65,8 @@ class SessionState:
         return cls(
             input_file_hash=data.get("input_file_hash", ""),
             session_created_at=created_at,
+            input_file_mtime_ns=data.get("input_file_mtime_ns"),
+            input_file_size=data.get("input_file_size"),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -64,31 +74,77 @@ class SessionState:
         return {
             "input_file_hash": self.input_file_hash,
             "session_created_at": self.session_created_at,
+            "input_file_mtime_ns": self.input_file_mtime_ns,
+            "input_file_size": self.input_file_size,
         }
 
 
-def _atomic_write(path: Path, content: str) -> None:
-    """Write file atomically using temp file + rename with file locking.
+def _as_path(path: str | Path) -> Path:
+    """Return path as a Path, reusing it if it already is one."""
+    return path if isinstance(path, Path) else Path(path)
+
+
+# Raw session file bytes per path, tagged with the (st_mtime_ns, st_ino,
+# st_size) of the file they were read from. Atomic writes replace the
+# inode, so any rewrite changes the tag. Bytes are immutable, so a hit
+# only has to json.loads them into a fresh dict for the caller.
+_STATE_CACHE: dict[Path, tuple[tuple[int, int, int], bytes]] = {}
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int]:
+    """Cache tag identifying one version of a file."""
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+# DEEP_PROJECT_NO_FSYNC=1 skips every fsync (the test suite sets it: its
+# tmp_path files never need to survive a crash). Renames stay atomic.
+FSYNC_ENABLED = os.environ.get("DEEP_PROJECT_NO_FSYNC") != "1"
+
+
+def _atomic_write(
+    path: str | Path,
+    content: str | bytes,
+    *,
+    durable: bool = True,
+    fsync_file: bool = True,
+    mode: int | None = None,
+) -> None:
+    """Write file atomically using temp file + rename.
 
     This ensures that file writes are atomic - either the entire
     content is written or the original file remains unchanged.
-    Uses a temp file in the same directory followed by rename.
-    File locking prevents concurrent write races.
+    Uses a uniquely named temp file in the same directory followed by
+    rename, so concurrent writers never share a temp file and readers
+    only ever see a complete file (last rename wins).
+
+    The temp file is fsynced before the rename so a crash cannot leave a
+    renamed but empty file; fsync_file=False skips that for callers that
+    can regenerate the file after a crash. With durable=True the parent
+    directory is fsynced afterwards as well, so the rename itself
+    survives a crash. Both are skipped when FSYNC_ENABLED is off.
+
+    The file is created 0600 by mkstemp unless mode is given.
+
+    Content may be str (written as UTF-8) or already-encoded bytes.
     """
-    path = Path(os.fspath(path))
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    path_str = os.fspath(path)
+    parent = os.path.dirname(path_str) or "."
     fd, tmp_path = tempfile.mkstemp(
-        dir=path.parent,
-        prefix=f".{path.name}.",
+        dir=parent,
+        prefix=f".{os.path.basename(path_str)}.",
         suffix=".tmp"
     )
     fd_closed = False
     try:
-        # Acquire exclusive lock
-        fcntl.flock(fd, fcntl.LOCK_EX)
-        os.write(fd, content.encode("utf-8"))
+        if mode is not None:
+            os.fchmod(fd, mode)
+        os.write(fd, data)
+        if fsync_file and FSYNC_ENABLED:
+            os.fsync(fd)
         os.close(fd)
         fd_closed = True
-        os.rename(tmp_path, path)
+        os.replace(tmp_path, path_str)
     except Exception:
         if not fd_closed:
             os.close(fd)
@@ -96,21 +152,75 @@ def _atomic_write(path: Path, content: str) -> None:
             os.unlink(tmp_path)
         raise
 
+    if durable and FSYNC_ENABLED and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# Files modified this recently are never served from a stat-keyed cache:
+# a rewrite within the same timestamp tick would leave the tag unchanged.
+RACY_WINDOW_NS = 1_000_000_000
+
+
+# Change detection only needs a fingerprint, not collision resistance
+# against an attacker, so the default is the faster BLAKE2b. SHA-256 is
+# kept so sessions recorded before the switch can still be verified.
+# usedforsecurity=False keeps FIPS-mode builds from rejecting or wrapping
+# the non-security use.
+HASH_ALGORITHMS = {
+    "blake2b": lambda: hashlib.blake2b(digest_size=32, usedforsecurity=False),
+    "sha256": lambda: hashlib.sha256(usedforsecurity=False),
+}
+DEFAULT_HASH_ALGORITHM = "blake2b"
 
-def compute_file_hash(file_path: str | Path) -> str:
-    """Compute SHA256 hash of file content.
 
-    Returns hash in format: sha256:<hexdigest>
+def compute_file_hash(
+    file_path: str | Path, algorithm: str = DEFAULT_HASH_ALGORITHM
+) -> str:
+    """Compute a content hash of a file.
+
+    Returns hash in format: <algorithm>:<hexdigest> (e.g. blake2b:...)
     Used for detecting if input file changed between sessions.
+    The file is streamed through the hasher rather than read into memory,
+    and digests are memoized per (path, mtime_ns, inode, size).
+
+    Args:
+        file_path: File to hash
+        algorithm: Key of HASH_ALGORITHMS to hash with
+
+    Returns:
+        Prefixed hex digest
     """
-    path = Path(os.fspath(file_path))
-    content = path.read_bytes()
-    return f"sha256:{hashlib.sha256(content).hexdigest()}"
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+        return _hash_file(path, algorithm)
+    return _hash_file_cached(path, algorithm, _stat_key(st))
+
+
+def _hash_file(path: str, algorithm: str) -> str:
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, HASH_ALGORITHMS[algorithm])
+    return f"{algorithm}:{digest.hexdigest()}"
+
 
+@functools.lru_cache(maxsize=128)
+def _hash_file_cached(
+    path: str, algorithm: str, stat_key: tuple[int, int, int]
+) -> str:
+    return _hash_file(path, algorithm)
 
+
+@functools.lru_cache(maxsize=128)
 def session_state_path(planning_dir: str | Path) -> Path:
-    """Get path to session state file."""
-    return Path(os.fspath(planning_dir)) / SESSION_FILENAME
+    """Get path to session state file.
+
+    Memoized: Path objects are immutable, so callers can share one.
+    """
+    return _as_path(planning_dir) / SESSION_FILENAME
 
 
 def session_state_exists(planning_dir: str | Path) -> bool:
@@ -121,22 +231,95 @@ def session_state_exists(planning_dir: str | Path) -> bool:
 def load_session_state(planning_dir: str | Path) -> dict[str, Any] | None:
     """Load session state, or None if not exists.
 
+    The file's bytes are cached per process and reused while its mtime,
+    inode and size are unchanged; every call parses a fresh dict.
+
     Raises:
         ValueError: If state file contains invalid JSON
     """
     path = session_state_path(planning_dir)
-    if not path.exists():
+    raw = _read_state_bytes(path)
+    if raw is None:
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return json.loads(raw)
     except json.JSONDecodeError as e:
         raise ValueError(f"Corrupted session state at {path}: {e}")
 
 
+def _read_state_bytes(path: Path) -> bytes | None:
+    """Return the bytes of the state file at path, or None if missing.
+
+    Files modified within RACY_WINDOW_NS are always read and never cached.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    key = _stat_key(st)
+    racy = time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS
+
+    cached = _STATE_CACHE.get(path)
+    if not racy and cached is not None and cached[0] == key:
+        return cached[1]
+
+    # Tag with the fstat of the fd actually read, not the earlier stat
+    try:
+        with open(path, "rb") as f:
+            key = _stat_key(os.fstat(f.fileno()))
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    if racy:
+        _STATE_CACHE.pop(path, None)
+    else:
+        _STATE_CACHE[path] = (key, raw)
+    return raw
+
+
 def save_session_state(planning_dir: str | Path, state: dict[str, Any]) -> None:
-    """Save session state atomically."""
+    """Save session state atomically.
+
+    Skips writing when the file on disk already holds the same bytes. The
+    cached bytes stand in for the file only outside RACY_WINDOW_NS;
+    otherwise the file is reread for the comparison.
+    """
     path = session_state_path(planning_dir)
-    _atomic_write(path, json.dumps(state, indent=2))
+    # json escapes non-ASCII, so the ASCII bytes go straight to the file
+    payload = dumps_json(state).encode("ascii")
+    if _read_state_bytes(path) == payload:
+        return
+    _atomic_write(path, payload)
+    # The next read re-tags the new file; a stat taken here could already
+    # belong to another process's rename
+    _STATE_CACHE.pop(path, None)
+
+
+def update_session_state(planning_dir: str | Path, **fields: Any) -> bool:
+    """Update individual session state fields, writing only on change.
+
+    Loads the current state, merges in the given fields and rewrites the
+    file. If every field already has the requested value the write is
+    skipped entirely.
+
+    Args:
+        planning_dir: Directory where session files are stored
+        **fields: Session state fields to set
+
+    Returns:
+        True if the state file was written, False if nothing changed
+    """
+    state = load_session_state(planning_dir) or {}
+    changed = {
+        key: value
+        for key, value in fields.items()
+        if key not in state or state[key] != value
+    }
+    if not changed:
+        return False
+    state.update(changed)
+    save_session_state(planning_dir, state)
+    return True
 
 
 def create_initial_session_state(initial_file: str | Path) -> dict[str, Any]:
@@ -150,28 +333,84 @@ def create_initial_session_state(initial_file: str | Path) -> dict[str, Any]:
     Returns:
         Initial state dictionary with minimal fields
     """
+    # Stat before hashing so a concurrent edit leaves a stale stat, which
+    # only forces a rehash later, never a missed change.
+    st = os.stat(initial_file)
     return {
         "input_file_hash": compute_file_hash(initial_file),
-        "session_created_at": datetime.now(timezone.utc).isoformat(),
+        "input_file_mtime_ns": st.st_mtime_ns,
+        "input_file_size": st.st_size,
+        "session_created_at": datetime.now(UTC).isoformat(timespec="seconds"),
     }
 
 
 def check_input_file_changed(
-    planning_dir: str | Path, initial_file: str | Path
+    planning_dir: str | Path,
+    initial_file: str | Path,
+    session_state: dict[str, Any] | None = None,
 ) -> bool | None:
     """Check if input file has changed since session started.
 
-    Compares current file hash against stored hash in session state.
+    Read-only; see input_file_status for the details and for the fresh
+    stat fields a caller can persist.
 
     Args:
         planning_dir: Directory where session files are stored
         initial_file: Path to the input requirements file
+        session_state: State the caller already loaded; loaded from
+            planning_dir when omitted
 
     Returns:
         True if file has changed, False if unchanged, None if no state exists
     """
-    state = load_session_state(planning_dir)
+    return input_file_status(planning_dir, initial_file, session_state)[0]
+
+
+def input_file_status(
+    planning_dir: str | Path,
+    initial_file: str | Path,
+    session_state: dict[str, Any] | None = None,
+) -> tuple[bool | None, dict[str, int]]:
+    """Check the input file against session state without writing anything.
+
+    If the file's mtime and size match the values stored in session state,
+    it is treated as unchanged without hashing. Otherwise (including legacy
+    state without stored stat fields) the file is hashed with the algorithm
+    named in the stored hash's prefix, so older sha256 sessions are still
+    compared like for like.
+
+    The file is stat'ed before it is hashed, so the returned stat fields
+    are safe to store alongside an unchanged hash: a concurrent edit can
+    only leave them stale, which forces a rehash next time.
+
+    Args:
+        planning_dir: Directory where session files are stored
+        initial_file: Path to the input requirements file
+        session_state: State the caller already loaded; loaded from
+            planning_dir when omitted
+
+    Returns:
+        (changed, stat_fields): changed is True/False, or None if no state
+        exists; stat_fields holds the current input_file_mtime_ns and
+        input_file_size (empty when there is no state)
+    """
+    state = session_state if session_state is not None else load_session_state(planning_dir)
     if state is None:
-        return None
-    current_hash = compute_file_hash(initial_file)
-    return current_hash != state.get("input_file_hash")
+        return None, {}
+
+    st = os.stat(initial_file)
+    stat_fields = {
+        "input_file_mtime_ns": st.st_mtime_ns,
+        "input_file_size": st.st_size,
+    }
+    if (
+        state.get("input_file_mtime_ns") == st.st_mtime_ns
+        and state.get("input_file_size") == st.st_size
+    ):
+        return False, stat_fields
+
+    stored_hash = state.get("input_file_hash", "")
+    algorithm = stored_hash.partition(":")[0]
+    if algorithm not in HASH_ALGORITHMS:
+        return True, stat_fields
+    return compute_file_hash(initial_file, algorithm) != stored_hash, stat_fields
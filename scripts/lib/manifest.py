@@ -1,14 +1,24 @@
 """Manifest parsing for /deep-project.
 
-Parses the SPLIT_MANIFEST block from project-manifest.md.
+Parses the SPLIT_MANIFEST block from project-manifest.md and creates
+the split directories it lists.
 """
 
+import functools
+import mmap
+import os
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Self
+from typing import Any, Self
 
-from .state import SPLIT_DIR_PATTERN
+from .config import (
+    RACY_WINDOW_NS,
+    SessionFilename,
+    load_session_state,
+)
+from .state import SPLIT_LINE_PATTERN, get_split_index
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -31,14 +41,24 @@ class ParsedManifest:
 
 # Regex to extract SPLIT_MANIFEST block
 MANIFEST_BLOCK_PATTERN = re.compile(
-    r"<!--\s*SPLIT_MANIFEST\s*\n(.*?)\nEND_MANIFEST\s*-->",
+    rb"<!--\s*SPLIT_MANIFEST\s*\n(.*?)\nEND_MANIFEST\s*-->",
     re.DOTALL
 )
 
+# Manifests at least this large are searched through an mmap instead of
+# being read into memory; below it the mapping costs more than the read.
+MMAP_THRESHOLD = 4096
+
 
 def parse_manifest(manifest_path: Path | str) -> ParsedManifest:
     """Parse SPLIT_MANIFEST block from project-manifest.md.
 
+    Results are cached per process on (absolute path, mtime_ns, size), so
+    re-parsing an unchanged manifest costs a single stat. A manifest
+    modified within RACY_WINDOW_NS is always parsed, since a same-size
+    rewrite in the same timestamp tick would leave the key unchanged.
+    Callers get their own splits and errors lists.
+
     Args:
         manifest_path: Path to project-manifest.md
 
@@ -47,43 +67,127 @@ def parse_manifest(manifest_path: Path | str) -> ParsedManifest:
     """
     manifest_path = Path(manifest_path)
 
-    if not manifest_path.exists():
+    try:
+        st = os.stat(manifest_path)
+    except FileNotFoundError:
         return ParsedManifest.error(f"Manifest file not found: {manifest_path}")
 
-    content = manifest_path.read_text()
+    path = os.path.abspath(manifest_path)
+    if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+        return _parse_manifest(path, st.st_size)
+    cached = _parse_manifest_cached(path, st.st_mtime_ns, st.st_size)
+    return ParsedManifest(splits=list(cached.splits), errors=list(cached.errors))
+
+
+def load_manifest(
+    planning_dir: Path | str, session_state: dict[str, Any] | None = None
+) -> ParsedManifest:
+    """Load the planning directory's manifest, reusing splits cached in session state.
+
+    Read-only; see manifest_status for the details and for the fields a
+    caller can persist.
+
+    Args:
+        planning_dir: Planning directory containing project-manifest.md
+        session_state: State the caller already loaded; loaded from
+            planning_dir when omitted
+
+    Returns:
+        ParsedManifest with splits list or errors
+    """
+    return manifest_status(planning_dir, session_state)[0]
+
+
+def manifest_status(
+    planning_dir: Path | str, session_state: dict[str, Any] | None = None
+) -> tuple[ParsedManifest, dict[str, Any]]:
+    """Load the manifest against session state without writing anything.
+
+    While the manifest's mtime_ns and size match the manifest_* fields in
+    session state, the recorded splits are returned without parsing
+    (including to other processes, once a caller has persisted them).
+    Otherwise the manifest is parsed, and a valid result comes back with
+    the fields to record. Nothing is returned to record when no session
+    state exists, or while the manifest is still within RACY_WINDOW_NS of
+    its last write.
+
+    Args:
+        planning_dir: Planning directory containing project-manifest.md
+        session_state: State the caller already loaded; loaded from
+            planning_dir when omitted
+
+    Returns:
+        (manifest, state_fields): the ParsedManifest, and the
+        manifest_splits, manifest_mtime_ns and manifest_size to store in
+        session state (empty when there is nothing new to record)
+    """
+    manifest_path = Path(planning_dir) / SessionFilename.MANIFEST
+    try:
+        st = os.stat(manifest_path)
+    except FileNotFoundError:
+        return ParsedManifest.error(f"Manifest file not found: {manifest_path}"), {}
+
+    state = session_state if session_state is not None else load_session_state(planning_dir)
+    if (
+        state is not None
+        and state.get("manifest_mtime_ns") == st.st_mtime_ns
+        and state.get("manifest_size") == st.st_size
+        and "manifest_splits" in state
+    ):
+        return ParsedManifest(splits=list(state["manifest_splits"]), errors=[]), {}
+
+    result = parse_manifest(manifest_path)
+    if (
+        state is None
+        or not result.is_valid
+        or time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS
+    ):
+        return result, {}
+    return result, {
+        "manifest_splits": list(result.splits),
+        "manifest_mtime_ns": st.st_mtime_ns,
+        "manifest_size": st.st_size,
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_manifest_cached(path: str, mtime_ns: int, size: int) -> ParsedManifest:
+    """Memoized _parse_manifest; mtime_ns only keys the cache."""
+    return _parse_manifest(path, size)
+
 
-    # Find the SPLIT_MANIFEST block
-    match = MANIFEST_BLOCK_PATTERN.search(content)
-    if not match:
+def _parse_manifest(path: str, size: int) -> ParsedManifest:
+    """Parse the manifest at path, which is size bytes long."""
+    block_content = _find_manifest_block(path, size)
+    if block_content is None:
         return ParsedManifest.error(
             "No SPLIT_MANIFEST block found. Expected format:\n"
             "<!-- SPLIT_MANIFEST\n01-name\n02-name\nEND_MANIFEST -->"
         )
 
-    block_content = match.group(1)
     lines = [line.strip() for line in block_content.strip().split("\n")]
     lines = [line for line in lines if line]  # Remove empty lines
 
     if not lines:
         return ParsedManifest.error("SPLIT_MANIFEST block is empty")
 
-    # Validate each split name
-    splits: list[str] = []
-    errors: list[str] = []
+    # Validate all split names in one regex pass; lines it skips are invalid
+    valid = SPLIT_LINE_PATTERN.findall("\n".join(lines))
+    valid_set = set(valid)
+    errors = [
+        f"Invalid split name '{line}': must match pattern NN-kebab-case "
+        "(e.g., 01-backend, 02-api-gateway)"
+        for line in lines
+        if line not in valid_set
+    ]
+    parsed = [(get_split_index(split), split) for split in valid]
 
-    for line in lines:
-        if not SPLIT_DIR_PATTERN.match(line):
-            errors.append(
-                f"Invalid split name '{line}': must match pattern NN-kebab-case "
-                "(e.g., 01-backend, 02-api-gateway)"
-            )
-        else:
-            splits.append(line)
+    splits = [split for _, split in parsed]
+    indices = [idx for idx, _ in parsed]
 
     # Check for duplicate indices
-    indices = [int(s[:2]) for s in splits]
     seen_indices: set[int] = set()
-    for idx, split in zip(indices, splits):
+    for idx, split in parsed:
         if idx in seen_indices:
             errors.append(f"Duplicate index {idx:02d} in split '{split}'")
         seen_indices.add(idx)
@@ -99,3 +203,55 @@ def parse_manifest(manifest_path: Path | str) -> ParsedManifest:
             )
 
     return ParsedManifest(splits=splits, errors=errors)
+
+
+def _find_manifest_block(path: str, size: int) -> str | None:
+    """Return the decoded SPLIT_MANIFEST block contents, or None if absent.
+
+    Only the matched block is decoded; large files are searched in place
+    through a read-only mmap.
+    """
+    with open(path, "rb") as f:
+        if size < MMAP_THRESHOLD:
+            match = MANIFEST_BLOCK_PATTERN.search(f.read())
+            return match.group(1).decode() if match else None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            match = MANIFEST_BLOCK_PATTERN.search(mm)
+            return match.group(1).decode() if match else None
+
+
+def create_split_dirs(
+    planning_dir: Path | str, splits: list[str]
+) -> tuple[list[str], list[str]]:
+    """Create split directories under planning_dir.
+
+    Lists planning_dir once up front and skips names already present, then
+    issues one mkdirat per remaining split relative to a single directory
+    fd. A split that appears in between (EEXIST) is still reported as
+    skipped.
+
+    Returns:
+        (created, skipped) split names, in manifest order
+    """
+    created: list[str] = []
+    skipped: list[str] = []
+
+    with os.scandir(planning_dir) as entries:
+        existing = {entry.name for entry in entries}
+
+    dir_fd = os.open(planning_dir, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for split_name in splits:
+            if split_name in existing:
+                skipped.append(split_name)
+                continue
+            try:
+                os.mkdir(split_name, dir_fd=dir_fd)
+            except FileExistsError:
+                skipped.append(split_name)
+            else:
+                created.append(split_name)
+    finally:
+        os.close(dir_fd)
+
+    return created, skipped
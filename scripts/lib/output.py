@@ -0,0 +1,35 @@
+"""JSON output helpers for /deep-project scripts.
+
+Script output is consumed by Claude, not edited by hand, so it is emitted
+compactly by default. Pretty printing is available for debugging.
+"""
+
+import json
+import sys
+from typing import Any
+
+# Compact separators: no whitespace after "," and ":"
+COMPACT_SEPARATORS = (",", ":")
+
+# json.dumps builds a fresh JSONEncoder whenever non-default options are
+# passed, so the two configurations used here are built once and reused.
+_COMPACT_ENCODER = json.JSONEncoder(separators=COMPACT_SEPARATORS)
+_PRETTY_ENCODER = json.JSONEncoder(indent=2)
+
+
+def dumps_json(data: Any, *, pretty: bool = False) -> str:
+    """Serialize data to JSON, compact unless pretty is requested."""
+    if pretty:
+        return _PRETTY_ENCODER.encode(data)
+    return _COMPACT_ENCODER.encode(data)
+
+
+def emit_json(data: dict[str, Any], *, pretty: bool = False) -> None:
+    """Write a script result to stdout as JSON.
+
+    json.dumps escapes non-ASCII by default, so the encoded bytes go
+    straight to the binary buffer, bypassing print() and the text codec.
+    """
+    sys.stdout.flush()  # keep ordering with any earlier text output
+    sys.stdout.buffer.write(dumps_json(data, pretty=pretty).encode("ascii") + b"\n")
+    sys.stdout.buffer.flush()
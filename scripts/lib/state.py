@@ -10,26 +10,46 @@ Checkpoints (files):
 
 Session JSON stores only:
 - input_file_hash (detect changes)
+- input_file_mtime_ns, input_file_size (skip rehashing an untouched file)
 - session_created_at (metadata)
+- manifest_splits, manifest_mtime_ns, manifest_size (skip reparsing the manifest)
 """
 
+import os
 import re
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TypedDict
+from typing import Any
 
-from .config import SessionFilename
+from .config import RACY_WINDOW_NS, SessionFilename
 
 
-class DetectStateResult(TypedDict):
-    """Return type for detect_state() function."""
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DetectStateResult:
+    """Return type for detect_state() function.
+
+    Immutable, so cached results can be handed out without copying.
+    """
 
     interview_complete: bool
     manifest_created: bool
     directories_created: bool
-    splits: list[str]
-    splits_with_specs: list[str]
+    splits: tuple[str, ...]
+    splits_with_specs: tuple[str, ...]
     resume_step: int
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "interview_complete": self.interview_complete,
+            "manifest_created": self.manifest_created,
+            "directories_created": self.directories_created,
+            "splits": list(self.splits),
+            "splits_with_specs": list(self.splits_with_specs),
+            "resume_step": self.resume_step,
+        }
+
 
 # Workflow steps mapping step number to step name.
 # Step 0 is setup/validation, steps 1-7 are the main workflow phases.
@@ -47,7 +67,10 @@ STEPS = {
 # Strict pattern for split directories: NN-kebab-case.
 # Requires two-digit prefix (01-99), hyphen separator, and lowercase alphanumeric segments.
 # Examples: "01-backend", "12-multi-word-name"
-SPLIT_DIR_PATTERN = re.compile(r"^\d{2}-[a-z0-9]+(?:-[a-z0-9]+)*$")
+SPLIT_DIR_PATTERN = re.compile(r"^[0-9]{2}-[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+# Same pattern applied per line, for validating a newline-separated list at once.
+SPLIT_LINE_PATTERN = re.compile(SPLIT_DIR_PATTERN.pattern, re.MULTILINE)
 
 
 def is_valid_split_dir(name: str) -> bool:
@@ -55,9 +78,37 @@ def is_valid_split_dir(name: str) -> bool:
     return bool(SPLIT_DIR_PATTERN.match(name))
 
 
+# Two-digit prefix -> index, so indices are looked up instead of parsed.
+_INDEX_LUT: dict[str, int] = {f"{i:02d}": i for i in range(100)}
+
+
 def get_split_index(name: str) -> int:
-    """Extract numeric index from split directory name."""
-    return int(name[:2])
+    """Extract numeric index from split directory name.
+
+    name must already match SPLIT_DIR_PATTERN, whose two-digit ASCII
+    prefix is always a key of the lookup table.
+    """
+    return _INDEX_LUT[name[:2]]
+
+
+# Cached detect_state results: abs planning_dir -> (mtime tag, result)
+_DETECT_CACHE: dict[str, tuple[tuple[int, ...], DetectStateResult]] = {}
+
+
+def _mtime_tag(planning_dir: Path, splits: tuple[str, ...]) -> tuple[int, ...] | None:
+    """mtime_ns of planning_dir and each split dir, or None if any is missing.
+
+    Checkpoints are file and directory existence, so any change to them
+    creates or removes an entry in one of these directories and bumps its
+    mtime.
+    """
+    try:
+        return (
+            os.stat(planning_dir).st_mtime_ns,
+            *(os.stat(planning_dir / s).st_mtime_ns for s in splits),
+        )
+    except FileNotFoundError:
+        return None
 
 
 def detect_state(planning_dir: Path | str) -> DetectStateResult:
@@ -68,26 +119,51 @@ def detect_state(planning_dir: Path | str) -> DetectStateResult:
     - Manifest created: project-manifest.md exists (Claude's proposal)
     - Directories created: NN-name/ directories exist (user confirmed)
     - Specs written: spec.md in each directory
+
+    Results are cached per planning_dir and reused while the mtimes of
+    planning_dir and its split directories are unchanged.
     """
     planning_dir = Path(planning_dir)
+    key = os.path.abspath(planning_dir)
+
+    cached = _DETECT_CACHE.get(key)
+    if cached is not None:
+        tag, result = cached
+        if _mtime_tag(planning_dir, result.splits) == tag:
+            return result
+
+    result = _detect_state_uncached(planning_dir)
+    tag = _mtime_tag(planning_dir, result.splits)
+    if tag is not None and time.time_ns() - max(tag) >= RACY_WINDOW_NS:
+        _DETECT_CACHE[key] = (tag, result)
+    else:
+        _DETECT_CACHE.pop(key, None)
+    return result
+
 
+def _detect_state_uncached(planning_dir: Path) -> DetectStateResult:
+    """Compute DetectStateResult from the filesystem without caching."""
     # Checkpoint 1: Interview complete (file exists)
-    interview_complete = (planning_dir / SessionFilename.INTERVIEW).exists()
+    interview_complete = os.path.exists(planning_dir / SessionFilename.INTERVIEW)
 
     # Checkpoint 2: Manifest created (Claude's proposal)
-    manifest_created = (planning_dir / SessionFilename.MANIFEST).exists()
+    manifest_created = os.path.exists(planning_dir / SessionFilename.MANIFEST)
 
     # Checkpoint 3: Split directories exist (user confirmed, output generation started)
-    splits = sorted([
-        d.name for d in planning_dir.iterdir()
-        if d.is_dir() and is_valid_split_dir(d.name)
-    ], key=get_split_index)
+    # DirEntry.is_dir() answers from the readdir entry type, no extra stat.
+    with os.scandir(planning_dir) as it:
+        pairs = [
+            (get_split_index(e.name), e.name) for e in it
+            if is_valid_split_dir(e.name) and e.is_dir()
+        ]
+    pairs.sort()
+    splits = tuple(name for _, name in pairs)
 
     # Checkpoint 4: Specs written (spec.md in each directory)
-    splits_with_specs = [
+    splits_with_specs = tuple(
         s for s in splits
-        if (planning_dir / s / "spec.md").exists()
-    ]
+        if os.path.exists(planning_dir / s / "spec.md")
+    )
 
     # Derive higher-level state
     directories_created = len(splits) > 0
@@ -109,14 +185,30 @@ def detect_state(planning_dir: Path | str) -> DetectStateResult:
         # Start from interview
         resume_step = 1  # Interview
 
-    return {
-        "interview_complete": interview_complete,
-        "manifest_created": manifest_created,
-        "directories_created": directories_created,
-        "splits": splits,
-        "splits_with_specs": splits_with_specs,
-        "resume_step": resume_step,
-    }
+    return DetectStateResult(
+        interview_complete=interview_complete,
+        manifest_created=manifest_created,
+        directories_created=directories_created,
+        splits=splits,
+        splits_with_specs=splits_with_specs,
+        resume_step=resume_step,
+    )
+
+
+# Workflow items: (content, activeForm, step)
+# Note: Steps 3 and 5 are never resume points - they happen inline
+# Step 3 ends with writing project-manifest.md (checkpoint for step 4)
+# Step 5 ends with directories created (checkpoint for step 6)
+_WORKFLOW_ITEMS: tuple[tuple[str, str, int], ...] = (
+    ("Validate input and setup session", "Setting up session", 0),
+    ("Conduct interview", "Interviewing user", 1),
+    ("Analyze splits", "Analyzing splits", 2),
+    ("Discover dependencies and write manifest", "Writing manifest", 3),
+    ("Confirm splits with user", "Confirming splits", 4),
+    ("Create split directories", "Creating directories", 5),
+    ("Generate spec files", "Generating specs", 6),
+    ("Output summary", "Outputting summary", 7),
+)
 
 
 def generate_todos(
@@ -128,7 +220,7 @@ def generate_todos(
     """Generate TODO list for workflow tracking."""
 
     # Context items (always completed)
-    context_items = [
+    todos = [
         {
             "content": f"plugin_root={plugin_root}",
             "status": "completed",
@@ -146,35 +238,17 @@ def generate_todos(
         }
     ]
 
-    # Workflow items
-    # Note: Steps 3 and 5 are never resume points - they happen inline
-    # Step 3 ends with writing project-manifest.md (checkpoint for step 4)
-    # Step 5 ends with directories created (checkpoint for step 6)
-    workflow_items = [
-        ("Validate input and setup session", "Setting up session", 0),
-        ("Conduct interview", "Interviewing user", 1),
-        ("Analyze splits", "Analyzing splits", 2),
-        ("Discover dependencies and write manifest", "Writing manifest", 3),
-        ("Confirm splits with user", "Confirming splits", 4),
-        ("Create split directories", "Creating directories", 5),
-        ("Generate spec files", "Generating specs", 6),
-        ("Output summary", "Outputting summary", 7),
-    ]
-
-    todos = context_items.copy()
-
-    for content, active_form, step in workflow_items:
-        if step < current_step:
-            status = "completed"
-        elif step == current_step:
-            status = "in_progress"
-        else:
-            status = "pending"
-
-        todos.append({
+    todos.extend(
+        {
             "content": content,
-            "status": status,
+            "status": (
+                "completed" if step < current_step
+                else "in_progress" if step == current_step
+                else "pending"
+            ),
             "activeForm": active_form
-        })
+        }
+        for content, active_form, step in _WORKFLOW_ITEMS
+    )
 
     return todos
@@ -7,6 +7,7 @@ and provides diagnostics for debugging /clear reset issues.
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from enum import StrEnum
@@ -55,41 +56,56 @@ class TaskListContext:
         Returns:
             TaskListContext with resolved task_list_id and source
         """
-        env_session_id = os.environ.get("DEEP_SESSION_ID")
-        user_specified = os.environ.get("CLAUDE_CODE_TASK_LIST_ID")
-
-        # Track if context and env matched (useful for debugging /clear issues)
-        session_id_matched: bool | None = None
-        if context_session_id and env_session_id:
-            session_id_matched = context_session_id == env_session_id
-
-        # Priority 1: --session-id from hook's additionalContext (most reliable)
-        if context_session_id:
-            return cls(
-                task_list_id=context_session_id,
-                source=TaskListSource.CONTEXT,
-                is_user_specified=False,
-                session_id_matched=session_id_matched,
-            )
-
-        # Priority 2: User-specified task list ID
-        if user_specified:
-            return cls(
-                task_list_id=user_specified,
-                source=TaskListSource.USER_ENV,
-                is_user_specified=True,
-            )
-
-        # Priority 3: Session ID from env var (may be stale after /clear)
-        if env_session_id:
-            return cls(
-                task_list_id=env_session_id,
-                source=TaskListSource.SESSION,
-                is_user_specified=False,
-            )
-
-        return cls(
-            task_list_id=None,
-            source=TaskListSource.NONE,
+        return _resolve_task_list_context(
+            context_session_id,
+            os.environ.get("DEEP_SESSION_ID"),
+            os.environ.get("CLAUDE_CODE_TASK_LIST_ID"),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_task_list_context(
+    context_session_id: str | None,
+    env_session_id: str | None,
+    user_specified: str | None,
+) -> TaskListContext:
+    """Resolve a TaskListContext; cached since the result is immutable.
+
+    The env values are part of the cache key, so changing either variable
+    resolves afresh.
+    """
+    # Track if context and env matched (useful for debugging /clear issues)
+    session_id_matched: bool | None = None
+    if context_session_id and env_session_id:
+        session_id_matched = context_session_id == env_session_id
+
+    # Priority 1: --session-id from hook's additionalContext (most reliable)
+    if context_session_id:
+        return TaskListContext(
+            task_list_id=context_session_id,
+            source=TaskListSource.CONTEXT,
             is_user_specified=False,
+            session_id_matched=session_id_matched,
         )
+
+    # Priority 2: User-specified task list ID
+    if user_specified:
+        return TaskListContext(
+            task_list_id=user_specified,
+            source=TaskListSource.USER_ENV,
+            is_user_specified=True,
+        )
+
+    # Priority 3: Session ID from env var (may be stale after /clear)
+    if env_session_id:
+        return TaskListContext(
+            task_list_id=env_session_id,
+            source=TaskListSource.SESSION,
+            is_user_specified=False,
+        )
+
+    return TaskListContext(
+        task_list_id=None,
+        source=TaskListSource.NONE,
+        is_user_specified=False,
+    )
@@ -11,12 +11,18 @@ This provides:
 
 from __future__ import annotations
 
+import functools
 import json
+import os
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import StrEnum
 from pathlib import Path
 from typing import Self
 
+from .config import FSYNC_ENABLED, _atomic_write
+from .output import dumps_json
+
 
 class TaskStatus(StrEnum):
     """Task status values for Claude Code task system."""
@@ -26,6 +32,15 @@ class TaskStatus(StrEnum):
     COMPLETED = "completed"
 
 
+@functools.cache
+def position_id(position: int) -> str:
+    """Task id string for a position (its "id" field and filename stem).
+
+    Cached, so every use of a position shares one str object.
+    """
+    return str(position)
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class TaskToWrite:
     """A task to write to disk.
@@ -48,16 +63,19 @@ class TaskToWrite:
     blocks: tuple[str, ...] = ()
     blocked_by: tuple[str, ...] = ()
 
-    def to_file_dict(self) -> dict[str, str | list[str]]:
-        """Convert to Claude Code task file format."""
+    def to_file_dict(self) -> dict[str, str | Sequence[str]]:
+        """Convert to Claude Code task file format.
+
+        blocks and blockedBy stay tuples; json serializes them as arrays.
+        """
         return {
-            "id": str(self.position),
+            "id": position_id(self.position),
             "subject": self.subject,
             "description": self.description,
             "activeForm": self.active_form,
-            "status": str(self.status),
-            "blocks": list(self.blocks),
-            "blockedBy": list(self.blocked_by),
+            "status": self.status.value,
+            "blocks": self.blocks,
+            "blockedBy": self.blocked_by,
         }
 
 
@@ -93,6 +111,12 @@ class TaskWriteResult:
         )
 
 
+@functools.cache
+def _tasks_root() -> Path:
+    """~/.claude/tasks, resolved once per process."""
+    return Path.home() / ".claude" / "tasks"
+
+
 def get_tasks_dir(task_list_id: str) -> Path:
     """Get the tasks directory for a task list ID.
 
@@ -102,10 +126,71 @@ def get_tasks_dir(task_list_id: str) -> Path:
     Returns:
         Path to ~/.claude/tasks/{task_list_id}/
     """
-    return Path.home() / ".claude" / "tasks" / task_list_id
+    return _tasks_root() / task_list_id
+
+
+# Task files are read by Claude Code, not edited by hand, so they are
+# written compact; DEEP_PROJECT_DEBUG_TASKS=1 indents them for debugging.
+PRETTY_TASK_FILES = os.environ.get("DEEP_PROJECT_DEBUG_TASKS") == "1"
+
+# Byte markers of an already-obsolete task file, in the format written by
+# this module (the separator depends on PRETTY_TASK_FILES)
+_KEY_SEP = b": " if PRETTY_TASK_FILES else b":"
+_OBSOLETE_SUBJECT = b'"subject"' + _KEY_SEP + b'"[obsolete]"'
+_COMPLETED_STATUS = b'"status"' + _KEY_SEP + b'"completed"'
+
+def _file_mode() -> int:
+    """Mode a plain open() would create files with under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once at import: probing os.umask sets it briefly, which would race
+# with files created by other threads
+TASK_FILE_MODE = _file_mode()
+
+
+def _write_file(path: str, payload: bytes) -> bool:
+    """Atomically replace path with payload, unless it already holds it.
+
+    Goes through config._atomic_write: a uniquely named hidden temp file
+    (not matched as *.json) renamed over path, so concurrent writers
+    never share a temp file and readers never see a partially written
+    task. The file gets the usual umask mode rather than mkstemp's 0600.
+
+    Neither the file nor the rename is fsynced here; the caller fsyncs
+    the directory once per batch. That makes the renames durable but not
+    the file contents, so a crash right after a batch can leave a task
+    file empty. The next write_tasks call rewrites any such file in its
+    batch, since the content no longer matches.
+
+    Returns:
+        True if the file was written, False if its content was unchanged
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == len(payload) and f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+
+    _atomic_write(path, payload, durable=False, fsync_file=False, mode=TASK_FILE_MODE)
+    return True
 
 
-def _mark_extra_obsolete(tasks_dir: Path, max_written_position: int) -> None:
+def _fsync_dir(path: str) -> None:
+    """fsync a directory so renames into it survive a crash."""
+    if not FSYNC_ENABLED or not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _mark_extra_obsolete(tasks_dir: Path, max_written_position: int) -> bool:
     """Mark existing task files beyond max_written_position as obsolete.
 
     When the task list shrinks (fewer tasks than before), we mark extra
@@ -115,30 +200,46 @@ def _mark_extra_obsolete(tasks_dir: Path, max_written_position: int) -> None:
     Args:
         tasks_dir: Directory containing task files
         max_written_position: Highest position written in current batch
+
+    Returns:
+        True if any task file was rewritten
     """
-    for task_file in tasks_dir.glob("*.json"):
-        try:
-            position = int(task_file.stem)
-            if position > max_written_position:
-                data = json.loads(task_file.read_text())
-                if (
-                    data.get("subject") == "[obsolete]"
-                    and data.get("status") == "completed"
-                ):
-                    continue  # Already obsolete
-                # Mark as obsolete (preserve blocks/blockedBy structure)
-                data["subject"] = "[obsolete]"
-                data["status"] = "completed"
-                data.setdefault("blocks", [])
-                data.setdefault("blockedBy", [])
-                task_file.write_text(json.dumps(data, indent=2))
-        except (ValueError, json.JSONDecodeError):
-            continue
+    wrote = False
+    with os.scandir(tasks_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            try:
+                position = int(entry.name[:-5])
+                if position > max_written_position:
+                    with open(entry.path, "rb") as f:
+                        raw = f.read()
+                    # Fast path: skip the decode for files we already
+                    # marked; anything else falls through to the full check
+                    if _OBSOLETE_SUBJECT in raw and _COMPLETED_STATUS in raw:
+                        continue
+                    data = json.loads(raw)
+                    if (
+                        data.get("subject") == "[obsolete]"
+                        and data.get("status") == "completed"
+                    ):
+                        continue  # Already obsolete
+                    # Mark as obsolete in place; the file belongs to Claude
+                    # Code, so every other field is kept as it was
+                    data["subject"] = "[obsolete]"
+                    data["status"] = "completed"
+                    data.setdefault("blocks", [])
+                    data.setdefault("blockedBy", [])
+                    payload = dumps_json(data, pretty=PRETTY_TASK_FILES).encode("ascii")
+                    wrote = _write_file(entry.path, payload) or wrote
+            except (ValueError, json.JSONDecodeError):
+                continue
+    return wrote
 
 
 def write_tasks(
     task_list_id: str,
-    tasks: list[TaskToWrite],
+    tasks: Sequence[TaskToWrite],
     dependency_graph: dict[int, tuple[list[str], list[str]]] | None = None,
     *,
     mark_extra_obsolete: bool = True,
@@ -163,7 +264,8 @@ def write_tasks(
 
     try:
         tasks_dir.mkdir(parents=True, exist_ok=True)
-        max_written_position = 0
+        tasks_dir_str = os.fspath(tasks_dir)
+        wrote = False
 
         for task in tasks:
             task_data = task.to_file_dict()
@@ -174,13 +276,19 @@ def write_tasks(
                 task_data["blocks"] = blocks
                 task_data["blockedBy"] = blocked_by
 
-            task_file = tasks_dir / f"{task.position}.json"
-            task_file.write_text(json.dumps(task_data, indent=2))
-            max_written_position = max(max_written_position, task.position)
+            wrote = _write_file(
+                os.path.join(tasks_dir_str, f"{task.position}.json"),
+                dumps_json(task_data, pretty=PRETTY_TASK_FILES).encode("ascii"),
+            ) or wrote
+
+        max_written_position = max((t.position for t in tasks), default=0)
 
         # Mark extra existing tasks as obsolete
         if mark_extra_obsolete:
-            _mark_extra_obsolete(tasks_dir, max_written_position)
+            wrote = _mark_extra_obsolete(tasks_dir, max_written_position) or wrote
+
+        if wrote:
+            _fsync_dir(tasks_dir_str)
 
         return TaskWriteResult.ok(task_list_id, len(tasks), tasks_dir)
 
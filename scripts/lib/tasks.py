@@ -6,10 +6,13 @@ for clearer dependency specification and mapping to positions.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import functools
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from itertools import chain
 from typing import Self
 
-from .task_storage import TaskStatus, TaskToWrite
+from .task_storage import TaskStatus, TaskToWrite, position_id
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -117,25 +120,38 @@ def build_semantic_to_position_map(start_position: int = 1) -> dict[str, int]:
     Returns:
         Dict mapping semantic ID to position number
     """
-    mapping = {}
-    position = start_position
-
-    # Workflow tasks first (in step order)
-    for step in sorted(TASK_IDS.keys()):
-        semantic_id = TASK_IDS[step]
-        mapping[semantic_id] = position
-        position += 1
-
-    # Context tasks at the end
-    for ctx_id in CONTEXT_TASK_IDS:
-        mapping[ctx_id] = position
-        position += 1
-
-    return mapping
+    # Workflow tasks first (in step order), context tasks at the end
+    semantic_ids = chain((TASK_IDS[step] for step in sorted(TASK_IDS)), CONTEXT_TASK_IDS)
+    return {
+        semantic_id: position
+        for position, semantic_id in enumerate(semantic_ids, start=start_position)
+    }
+
+
+# Default semantic ID -> position mapping, built once at import.
+# Its inputs are module constants; treat it as read-only.
+SEMANTIC_TO_POSITION: dict[str, int] = build_semantic_to_position_map()
+
+
+# Workflow tasks in step order, all PENDING; generate_expected_tasks only
+# swaps in the status for each call
+_WORKFLOW_TEMPLATES: tuple[tuple[int, TaskToWrite], ...] = tuple(
+    (
+        step,
+        TaskToWrite(
+            position=SEMANTIC_TO_POSITION[TASK_IDS[step]],
+            subject=TASK_DEFINITIONS[TASK_IDS[step]].subject,
+            status=TaskStatus.PENDING,
+            description=TASK_DEFINITIONS[TASK_IDS[step]].description,
+            active_form=TASK_DEFINITIONS[TASK_IDS[step]].active_form,
+        ),
+    )
+    for step in sorted(TASK_IDS)
+)
 
 
 def build_dependency_graph(
-    tasks: list[TaskToWrite],
+    tasks: Sequence[TaskToWrite],
     semantic_dependencies: dict[str, list[str]],
     semantic_to_position: dict[str, int],
 ) -> dict[int, tuple[list[str], list[str]]]:
@@ -149,39 +165,45 @@ def build_dependency_graph(
     Returns:
         Dict of position -> (blocks, blockedBy) as position string lists
     """
-    blocks: dict[int, list[str]] = {t.position: [] for t in tasks}
-    blocked_by: dict[int, list[str]] = {t.position: [] for t in tasks}
+    blocks: dict[int, list[int]] = {t.position: [] for t in tasks}
+    blocked_by: dict[int, list[int]] = {t.position: [] for t in tasks}
 
-    # Build blockedBy from semantic dependencies
+    # Fill blockedBy from semantic dependencies and its inverse, blocks,
+    # in the same pass
     for semantic_id, deps in semantic_dependencies.items():
-        if semantic_id not in semantic_to_position:
-            continue
-        position = semantic_to_position[semantic_id]
+        position = semantic_to_position.get(semantic_id)
         if position not in blocked_by:
             continue
         for dep_id in deps:
-            if dep_id in semantic_to_position:
-                dep_position = semantic_to_position[dep_id]
-                blocked_by[position].append(str(dep_position))
-
-    # Build blocks (inverse of blockedBy)
-    for position, deps in blocked_by.items():
-        for dep_pos_str in deps:
-            dep_pos = int(dep_pos_str)
-            if dep_pos in blocks:
-                blocks[dep_pos].append(str(position))
-
-    return {pos: (blocks[pos], blocked_by[pos]) for pos in blocks}
+            dep_position = semantic_to_position.get(dep_id)
+            if dep_position is None:
+                continue
+            blocked_by[position].append(dep_position)
+            if dep_position in blocks:
+                blocks[dep_position].append(position)
+
+    # Stringify once, at the end
+    return {
+        pos: (
+            [position_id(p) for p in blocks[pos]],
+            [position_id(p) for p in blocked_by[pos]],
+        )
+        for pos in blocks
+    }
 
 
+@functools.lru_cache(maxsize=32)
 def generate_expected_tasks(
     current_step: int,
     plugin_root: str,
     planning_dir: str,
     initial_file: str,
-) -> list[TaskToWrite]:
+) -> tuple[TaskToWrite, ...]:
     """Generate expected tasks based on workflow state.
 
+    The result depends only on the arguments and is memoized; it is a
+    tuple of frozen tasks, so the cached value is safe to share.
+
     Args:
         current_step: Current workflow step (0-7)
         plugin_root: Path to the plugin root directory
@@ -189,17 +211,13 @@ def generate_expected_tasks(
         initial_file: Path to the initial requirements file
 
     Returns:
-        List of TaskToWrite objects ready for writing
+        Tuple of TaskToWrite objects ready for writing
     """
-    semantic_to_position = build_semantic_to_position_map()
+    semantic_to_position = SEMANTIC_TO_POSITION
     tasks: list[TaskToWrite] = []
 
-    # Generate workflow tasks
-    for step in sorted(TASK_IDS.keys()):
-        semantic_id = TASK_IDS[step]
-        definition = TASK_DEFINITIONS[semantic_id]
-        position = semantic_to_position[semantic_id]
-
+    # Generate workflow tasks from the prebuilt templates
+    for step, template in _WORKFLOW_TEMPLATES:
         # Determine status based on current step
         if step < current_step:
             status = TaskStatus.COMPLETED
@@ -208,15 +226,7 @@ def generate_expected_tasks(
         else:
             status = TaskStatus.PENDING
 
-        tasks.append(
-            TaskToWrite(
-                position=position,
-                subject=definition.subject,
-                status=status,
-                description=definition.description,
-                active_form=definition.active_form,
-            )
-        )
+        tasks.append(template if template.status is status else replace(template, status=status))
 
     # Generate context tasks (store values in subject for visibility)
     context_items = [
@@ -231,7 +241,7 @@ def generate_expected_tasks(
     for ctx_id, value in context_items:
         position = semantic_to_position[ctx_id]
         # Context tasks are blocked by final task so they stay pending until end
-        blocked_by = (str(output_summary_position),) if output_summary_position else ()
+        blocked_by = (position_id(output_summary_position),) if output_summary_position else ()
 
         tasks.append(
             TaskToWrite(
@@ -244,4 +254,4 @@ def generate_expected_tasks(
             )
         )
 
-    return tasks
+    return tuple(tasks)
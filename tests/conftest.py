@@ -1,9 +1,45 @@
 """Shared fixtures for /deep-project tests."""
 
 import os
+import shutil
+import sys
+import tempfile
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Make scripts/lib importable as "lib" in every test module
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+# Test files live in tmp_path and never need to survive a crash; this is
+# inherited by the scripts the tests run as subprocesses.
+os.environ.setdefault("DEEP_PROJECT_NO_FSYNC", "1")
+
+# RAM-backed directory for tmp_path on Linux, where /tmp may be disk
+SHM_DIR = Path("/dev/shm")
+
+
+def pytest_configure(config):
+    """Put tmp_path under /dev/shm unless --basetemp was given.
+
+    xdist workers inherit the controller's basetemp, so only the process
+    that creates the directory removes it again.
+    """
+    if config.option.basetemp is not None:
+        return
+    if not (SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK | os.X_OK)):
+        return
+    basetemp = tempfile.mkdtemp(prefix="deep-project-pytest-", dir=SHM_DIR)
+    config.option.basetemp = basetemp
+    config._deep_project_shm_basetemp = basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the /dev/shm basetemp created in pytest_configure."""
+    basetemp = getattr(config, "_deep_project_shm_basetemp", None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
 
 @pytest.fixture
 def fixtures_dir():
@@ -11,6 +47,21 @@ def fixtures_dir():
     return Path(__file__).parent / "fixtures"
 
 
+@pytest.fixture(scope="session")
+def thread_pool():
+    """Worker threads shared by the concurrency tests."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+
+@pytest.fixture(autouse=True)
+def _clear_tasks_root():
+    """Forget the cached ~/.claude/tasks so each test's Path.home() applies."""
+    task_storage = sys.modules.get("lib.task_storage")
+    if task_storage is not None:
+        task_storage._tasks_root.cache_clear()
+
+
 @pytest.fixture
 def mock_session_id():
     """Return a mock session ID for testing."""
@@ -44,10 +95,10 @@ def sample_requirements(fixtures_dir):
     return (fixtures_dir / "sample_requirements.md").read_text()
 
 
-@pytest.fixture
-def tmp_planning_dir(tmp_path):
-    """Create temporary planning directory with sample input."""
-    planning_dir = tmp_path / "planning"
+@pytest.fixture(scope="session")
+def _planning_dir_template(tmp_path_factory):
+    """Build the sample planning directory once per session (read-only)."""
+    planning_dir = tmp_path_factory.mktemp("templates") / "planning"
     planning_dir.mkdir()
 
     # Create sample input file
@@ -57,10 +108,10 @@ def tmp_planning_dir(tmp_path):
     return planning_dir
 
 
-@pytest.fixture
-def mock_plugin_root(tmp_path):
-    """Create mock plugin root directory with expected structure."""
-    plugin_root = tmp_path / "plugin"
+@pytest.fixture(scope="session")
+def _plugin_root_template(tmp_path_factory):
+    """Build the mock plugin layout once per session (read-only)."""
+    plugin_root = tmp_path_factory.mktemp("templates") / "plugin"
     plugin_root.mkdir()
 
     # Create expected plugin directory structure
@@ -71,3 +122,15 @@ def mock_plugin_root(tmp_path):
     (plugin_root / "tests" / "fixtures").mkdir(parents=True)
 
     return plugin_root
+
+
+@pytest.fixture
+def tmp_planning_dir(tmp_path, _planning_dir_template):
+    """Create temporary planning directory with sample input."""
+    return Path(shutil.copytree(_planning_dir_template, tmp_path / "planning", symlinks=True))
+
+
+@pytest.fixture
+def mock_plugin_root(tmp_path, _plugin_root_template):
+    """Create mock plugin root directory with expected structure."""
+    return Path(shutil.copytree(_plugin_root_template, tmp_path / "plugin", symlinks=True))
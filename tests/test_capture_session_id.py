@@ -1,33 +1,28 @@
 """Tests for capture-session-id.py hook."""
 
+import importlib.util
 import json
+import os
 import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
 
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "hooks" / "capture-session-id.py"
+
+_spec = importlib.util.spec_from_file_location("capture_session_id", SCRIPT_PATH)
+capture_session_id = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(capture_session_id)
+
+
 def run_hook(payload: dict, env: dict | None = None) -> tuple[int, str, str]:
-    """Run the hook script with a JSON payload on stdin."""
-    import os
-
-    script_path = Path(__file__).parent.parent / "scripts" / "hooks" / "capture-session-id.py"
-
-    run_env = os.environ.copy()
-    if env:
-        run_env.update(env)
-
-    result = subprocess.run(
-        ["uv", "run", str(script_path)],
-        input=json.dumps(payload),
-        capture_output=True,
-        text=True,
-        env=run_env,
-        cwd=Path(__file__).parent.parent,
+    """Run the hook in-process with a JSON payload as its stdin."""
+    return capture_session_id.run(
+        json.dumps(payload).encode(), {**os.environ, **(env or {})}
     )
 
-    return result.returncode, result.stdout, result.stderr
-
 
 class TestCaptureSessionIdHook:
     """Tests for the SessionStart hook."""
@@ -80,17 +75,10 @@ class TestCaptureSessionIdHook:
 
     def test_invalid_json_succeeds_silently(self):
         """Should return 0 even with invalid JSON input."""
-        script_path = Path(__file__).parent.parent / "scripts" / "hooks" / "capture-session-id.py"
-
-        result = subprocess.run(
-            ["uv", "run", str(script_path)],
-            input="not valid json",
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent,
-        )
+        returncode, stdout, stderr = capture_session_id.run(b"not valid json", os.environ)
 
-        assert result.returncode == 0
+        assert returncode == 0
+        assert stdout == ""
 
     def test_skips_duplicate_session_id_in_env_file(self, tmp_path):
         """Should not write duplicate session_id to env file."""
@@ -105,6 +93,24 @@ class TestCaptureSessionIdHook:
         env_content = env_file.read_text()
         assert env_content.count("DEEP_SESSION_ID=test-session-123") == 1
 
+    def test_appends_only_missing_lines(self, tmp_path):
+        """Should keep existing lines and append only the missing assignment."""
+        env_file = tmp_path / "claude_env"
+        env_file.write_text("export OTHER=1\nexport DEEP_SESSION_ID=test-session-123\n")
+
+        payload = {
+            "session_id": "test-session-123",
+            "transcript_path": "/path/to/transcript.md"
+        }
+
+        run_hook(payload, env={"CLAUDE_ENV_FILE": str(env_file)})
+
+        assert env_file.read_text() == (
+            "export OTHER=1\n"
+            "export DEEP_SESSION_ID=test-session-123\n"
+            "export CLAUDE_TRANSCRIPT_PATH=/path/to/transcript.md\n"
+        )
+
     def test_missing_session_id_succeeds(self):
         """Should return 0 when payload has no session_id."""
         payload = {"other_field": "value"}
@@ -164,3 +170,25 @@ class TestCaptureSessionIdHook:
         assert returncode == 0
         output = json.loads(stdout)
         assert output["hookSpecificOutput"]["additionalContext"] == "DEEP_SESSION_ID=test-session-789"
+
+
+@pytest.mark.integration
+class TestCaptureSessionIdScript:
+    """Smoke test for the hook run as a script."""
+
+    def test_outputs_session_id_via_stdin(self):
+        """Should read stdin and write the additionalContext JSON to stdout."""
+        env = os.environ.copy()
+        env.pop("DEEP_SESSION_ID", None)
+
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT_PATH)],
+            input=json.dumps({"session_id": "test-session-123"}).encode(),
+            capture_output=True,
+            env=env,
+            cwd=Path(__file__).parent.parent,
+        )
+
+        assert result.returncode == 0
+        output = json.loads(result.stdout)
+        assert output["hookSpecificOutput"]["additionalContext"] == "DEEP_SESSION_ID=test-session-123"
@@ -7,12 +7,9 @@ Design principle: Session JSON is minimal, state derived from files.
 import json
 import os
 import threading
-import time
 import pytest
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 from lib.config import (
     _atomic_write,
     compute_file_hash,
@@ -20,13 +17,23 @@ from lib.config import (
     session_state_exists,
     load_session_state,
     save_session_state,
+    update_session_state,
     create_initial_session_state,
     check_input_file_changed,
+    input_file_status,
     SESSION_FILENAME,
     SessionFilename,
     SessionState,
 )
 
+# Session file contents that are not valid JSON
+CORRUPT_JSON = b"not valid json {{{"
+
+
+def _deny_replace(src, dst):
+    """Stand-in for os.replace that fails like a read-only directory."""
+    raise PermissionError(13, "Permission denied", dst)
+
 
 class TestAtomicWrite:
     """Tests for atomic file writing."""
@@ -41,26 +48,69 @@ class TestAtomicWrite:
         assert file_path.exists()
         assert file_path.read_text() == content
 
-    def test_atomic_on_failure_preserves_original(self, tmp_path):
+    def test_writes_bytes_content(self, tmp_path):
+        """Should write pre-encoded bytes unchanged."""
+        file_path = tmp_path / "test.json"
+
+        _atomic_write(file_path, b'{"a":1}')
+
+        assert file_path.read_bytes() == b'{"a":1}'
+
+    def test_fsyncs_file_and_directory(self, tmp_path, monkeypatch):
+        """Should fsync the temp file, and the parent dir unless durable=False."""
+        calls = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+        monkeypatch.setattr("lib.config.FSYNC_ENABLED", True)
+
+        _atomic_write(tmp_path / "durable.json", "content")
+        assert len(calls) == 2
+
+        calls.clear()
+        _atomic_write(tmp_path / "fast.json", "content", durable=False)
+        assert len(calls) == 1
+
+    def test_skips_file_fsync_when_asked(self, tmp_path, monkeypatch):
+        """fsync_file=False should skip the temp file fsync."""
+        calls = []
+        monkeypatch.setattr(os, "fsync", calls.append)
+        monkeypatch.setattr("lib.config.FSYNC_ENABLED", True)
+
+        _atomic_write(tmp_path / "file.json", "content", durable=False, fsync_file=False)
+
+        assert calls == []
+
+    def test_applies_requested_mode(self, tmp_path):
+        """Should create the file with the given mode instead of 0600."""
+        _atomic_write(tmp_path / "default.json", "content")
+        _atomic_write(tmp_path / "shared.json", "content", mode=0o644)
+
+        assert (tmp_path / "default.json").stat().st_mode & 0o777 == 0o600
+        assert (tmp_path / "shared.json").stat().st_mode & 0o777 == 0o644
+
+    def test_no_fsync_when_disabled(self, tmp_path, monkeypatch):
+        """Should skip every fsync when FSYNC_ENABLED is off."""
+        calls = []
+        monkeypatch.setattr(os, "fsync", calls.append)
+        monkeypatch.setattr("lib.config.FSYNC_ENABLED", False)
+
+        _atomic_write(tmp_path / "file.json", "content")
+
+        assert calls == []
+        assert (tmp_path / "file.json").read_bytes() == b"content"
+
+    def test_atomic_on_failure_preserves_original(self, tmp_path, monkeypatch):
         """Should preserve original file if write fails mid-operation."""
-        # Create a file in a directory we'll make read-only
-        readonly_dir = tmp_path / "readonly"
-        readonly_dir.mkdir()
-        readonly_file = readonly_dir / "test.txt"
-        original_content = "original"
-        readonly_file.write_text(original_content)
-
-        # Make directory read-only to prevent temp file creation
-        os.chmod(readonly_dir, 0o555)
-        try:
-            with pytest.raises(PermissionError):
-                _atomic_write(readonly_file, "new content")
-            # Restore permissions to read
-            os.chmod(readonly_dir, 0o755)
-            # Original should be unchanged
-            assert readonly_file.read_text() == original_content
-        finally:
-            os.chmod(readonly_dir, 0o755)
+        file_path = tmp_path / "test.txt"
+        original_content = b"original"
+        file_path.write_bytes(original_content)
+
+        monkeypatch.setattr(os, "replace", _deny_replace)
+        with pytest.raises(PermissionError):
+            _atomic_write(file_path, "new content")
+
+        # Original should be unchanged
+        assert file_path.read_bytes() == original_content
 
     def test_no_temp_file_left_on_success(self, tmp_path):
         """Should clean up temp file after successful write."""
@@ -71,112 +121,137 @@ class TestAtomicWrite:
         temp_files = list(tmp_path.glob(".test.txt.*"))
         assert len(temp_files) == 0
 
-    def test_no_temp_file_left_on_failure(self, tmp_path):
+    def test_no_temp_file_left_on_failure(self, tmp_path, monkeypatch):
         """Should clean up temp file if rename fails."""
-        readonly_dir = tmp_path / "readonly"
-        readonly_dir.mkdir()
-        readonly_file = readonly_dir / "test.txt"
-        readonly_file.write_text("original")
-
-        os.chmod(readonly_dir, 0o444)
-        try:
-            with pytest.raises(PermissionError):
-                _atomic_write(readonly_file, "new content")
-            # Temp files should be cleaned up
-            temp_files = list(tmp_path.glob("**/.test.txt.*"))
-            assert len(temp_files) == 0
-        finally:
-            os.chmod(readonly_dir, 0o755)
+        file_path = tmp_path / "test.txt"
+        file_path.write_bytes(b"original")
+
+        monkeypatch.setattr(os, "replace", _deny_replace)
+        with pytest.raises(PermissionError):
+            _atomic_write(file_path, "new content")
+
+        # Temp files should be cleaned up
+        temp_files = list(tmp_path.glob(".test.txt.*"))
+        assert len(temp_files) == 0
 
 
 class TestConcurrentAccess:
-    """Tests for concurrent file access with locking."""
+    """Tests for concurrent atomic writes (last rename wins)."""
 
-    def test_concurrent_writes_do_not_corrupt(self, tmp_path):
+    def test_concurrent_writes_do_not_corrupt(self, tmp_path, thread_pool):
         """Multiple concurrent writes should not corrupt file."""
         file_path = tmp_path / "concurrent.txt"
-        results = []
-        errors = []
-
-        def writer(value: str, delay: float):
-            try:
-                time.sleep(delay)
-                _atomic_write(file_path, value)
-                results.append(value)
-            except Exception as e:
-                errors.append(e)
-
-        # Start multiple threads writing different values
-        threads = [
-            threading.Thread(target=writer, args=(f"value-{i}", i * 0.01))
-            for i in range(5)
-        ]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-
-        assert len(errors) == 0
+        values = [f"value-{i}" for i in range(5)]
+        # Release all writers at once for maximum contention
+        barrier = threading.Barrier(len(values))
+
+        def writer(value: str):
+            barrier.wait(timeout=10)
+            _atomic_write(file_path, value)
+
+        # Re-raises the first writer exception, if any
+        list(thread_pool.map(writer, values))
+
         # File should have one of the values (last writer wins)
         content = file_path.read_text()
         assert content.startswith("value-")
         # Content should not be corrupted/mixed
-        assert content in [f"value-{i}" for i in range(5)]
+        assert content in values
 
-    def test_lock_serializes_writes(self, tmp_path):
-        """File locking should serialize concurrent write attempts."""
-        file_path = tmp_path / "locked.txt"
-        write_order = []
+    def test_overlapping_writes_last_rename_wins(self, tmp_path, monkeypatch):
+        """A write overlapping another should land whole, last rename winning.
 
-        def writer(value: str):
-            _atomic_write(file_path, value)
-            write_order.append(value)
+        Interleaves deterministically without threads: while the outer write
+        is about to rename, a complete inner write runs first.
+        """
+        file_path = tmp_path / "overlap.txt"
+        renames = []
+        real_replace = os.replace
+
+        def overlapping_replace(src, dst):
+            renames.append((src, Path(src).read_bytes()))
+            if len(renames) == 1:
+                _atomic_write(file_path, "inner")
+            real_replace(src, dst)
 
-        threads = [
-            threading.Thread(target=writer, args=(f"w{i}",))
-            for i in range(3)
-        ]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        monkeypatch.setattr(os, "replace", overlapping_replace)
 
-        # All writes should complete
-        assert len(write_order) == 3
-        # Final content should match last write
-        assert file_path.read_text() == write_order[-1]
+        _atomic_write(file_path, "outer")
+
+        # Each write used its own temp file and landed whole
+        assert [data for _, data in renames] == [b"outer", b"inner"]
+        assert renames[0][0] != renames[1][0]
+        # The outer write renamed last, so it wins
+        assert file_path.read_bytes() == b"outer"
+        assert list(tmp_path.glob(".overlap.txt.*")) == []
 
 
 class TestComputeFileHash:
     """Tests for file hash computation."""
 
-    def test_returns_sha256_format(self, tmp_path):
-        """Should return sha256:hexdigest format."""
+    @pytest.mark.parametrize(
+        "algorithm",
+        [
+            None,  # default
+            "blake2b",
+            "sha256",  # kept for legacy comparisons
+        ],
+    )
+    def test_returns_prefixed_hex_digest(self, tmp_path, algorithm):
+        """Should return <algorithm>:<64 hex chars>, blake2b by default."""
         file_path = tmp_path / "test.md"
-        file_path.write_text("test content")
+        file_path.write_bytes(b"test content")
+
+        if algorithm is None:
+            result = compute_file_hash(str(file_path))
+        else:
+            result = compute_file_hash(str(file_path), algorithm)
+
+        prefix, digest = result.split(":")
+        assert prefix == (algorithm or "blake2b")
+        assert len(digest) == 64
+        assert int(digest, 16) >= 0
+
+    @pytest.mark.parametrize(
+        "content_a, content_b, same",
+        [
+            (b"identical content", b"identical content", True),
+            (b"content A", b"content B", False),
+        ],
+    )
+    def test_hash_tracks_content(self, tmp_path, content_a, content_b, same):
+        """Same content should hash the same, different content differently."""
+        file1 = tmp_path / "file1.md"
+        file2 = tmp_path / "file2.md"
+        file1.write_bytes(content_a)
+        file2.write_bytes(content_b)
 
-        result = compute_file_hash(str(file_path))
+        assert (compute_file_hash(str(file1)) == compute_file_hash(str(file2))) is same
 
-        assert result.startswith("sha256:")
-        assert len(result) == 7 + 64  # "sha256:" + 64 hex chars
+    def test_reuses_digest_for_unchanged_file(self, tmp_path, monkeypatch):
+        """Should not rehash a file whose stat is unchanged."""
+        file_path = tmp_path / "test.md"
+        file_path.write_bytes(b"test content")
+        os.utime(file_path, ns=(1_000_000_000, 1_000_000_000))
+        first = compute_file_hash(str(file_path))
 
-    def test_same_content_same_hash(self, tmp_path):
-        """Same content should produce same hash."""
-        file1 = tmp_path / "file1.md"
-        file2 = tmp_path / "file2.md"
-        file1.write_text("identical content")
-        file2.write_text("identical content")
+        def fail_digest(f, algorithm):
+            raise AssertionError("file was rehashed")
 
-        assert compute_file_hash(str(file1)) == compute_file_hash(str(file2))
+        monkeypatch.setattr("lib.config.hashlib.file_digest", fail_digest)
+        assert compute_file_hash(str(file_path)) == first
 
-    def test_different_content_different_hash(self, tmp_path):
-        """Different content should produce different hash."""
-        file1 = tmp_path / "file1.md"
-        file2 = tmp_path / "file2.md"
-        file1.write_text("content A")
-        file2.write_text("content B")
+    def test_rehashes_after_change(self, tmp_path):
+        """Should rehash when the file's size changes, even with the same mtime."""
+        file_path = tmp_path / "test.md"
+        file_path.write_bytes(b"content A")
+        os.utime(file_path, ns=(1_000_000_000, 1_000_000_000))
+        first = compute_file_hash(str(file_path))
+
+        file_path.write_bytes(b"content AB")
+        os.utime(file_path, ns=(1_000_000_000, 1_000_000_000))
 
-        assert compute_file_hash(str(file1)) != compute_file_hash(str(file2))
+        assert compute_file_hash(str(file_path)) != first
 
 
 class TestSessionState:
@@ -187,6 +262,10 @@ class TestSessionState:
         path = session_state_path(str(tmp_path))
         assert path == tmp_path / SESSION_FILENAME
 
+    def test_session_state_path_is_memoized(self, tmp_path):
+        """Repeated calls with the same directory should share one Path."""
+        assert session_state_path(str(tmp_path)) is session_state_path(str(tmp_path))
+
     def test_session_state_exists_false(self, tmp_path):
         """Should return False when no state exists."""
         assert session_state_exists(str(tmp_path)) is False
@@ -220,12 +299,118 @@ class TestSessionState:
         save_session_state(str(tmp_path), state)
 
         assert (tmp_path / SESSION_FILENAME).exists()
-        loaded = json.loads((tmp_path / SESSION_FILENAME).read_text())
+        loaded = json.loads((tmp_path / SESSION_FILENAME).read_bytes())
         assert loaded == state
 
+    def test_saves_non_ascii_values_escaped(self, tmp_path):
+        """Non-ASCII values should round-trip through an ASCII-only file."""
+        state = {"manifest_splits": ["01-café"]}
+
+        save_session_state(str(tmp_path), state)
+
+        raw = (tmp_path / SESSION_FILENAME).read_bytes()
+        assert raw.isascii()
+        assert json.loads(raw) == state
+
+    def test_load_reflects_external_rewrite(self, tmp_path):
+        """Should re-read state after the file is replaced on disk."""
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:abc"}
+
+        replacement = tmp_path / "replacement.json"
+        replacement.write_text(json.dumps({"input_file_hash": "sha256:other"}))
+        os.replace(replacement, tmp_path / SESSION_FILENAME)
+
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:other"}
+
+    def test_reuses_bytes_of_aged_file(self, tmp_path, monkeypatch):
+        """Should not reopen a state file that is unchanged and outside the racy window."""
+        state_file = tmp_path / SESSION_FILENAME
+        state_file.write_text(json.dumps({"input_file_hash": "sha256:abc"}))
+        os.utime(state_file, ns=(1_000_000_000, 1_000_000_000))
+        load_session_state(str(tmp_path))
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("state file was reread")
+
+        monkeypatch.setattr("lib.config.open", fail_open, raising=False)
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:abc"}
+
+    def test_rereads_same_tick_rewrite(self, tmp_path):
+        """A same-size rewrite keeping the mtime should be seen while racy."""
+        state_file = tmp_path / SESSION_FILENAME
+        state_file.write_text(json.dumps({"input_file_hash": "sha256:aaa"}))
+        st = state_file.stat()
+        load_session_state(str(tmp_path))
+
+        state_file.write_text(json.dumps({"input_file_hash": "sha256:bbb"}))
+        os.utime(state_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:bbb"}
+
+    def test_loaded_state_mutation_does_not_leak(self, tmp_path):
+        """Mutating a loaded dict should not affect later loads."""
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+
+        loaded = load_session_state(str(tmp_path))
+        loaded["input_file_hash"] = "mutated"
+
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:abc"}
+
+    def test_nested_list_mutation_does_not_leak(self, tmp_path):
+        """Mutating a list inside a loaded dict should not affect later loads."""
+        save_session_state(str(tmp_path), {"manifest_splits": ["01-a"]})
+
+        load_session_state(str(tmp_path))["manifest_splits"].append("02-b")
+
+        assert load_session_state(str(tmp_path)) == {"manifest_splits": ["01-a"]}
+
+    def test_saves_nested_list_mutated_in_place(self, tmp_path):
+        """Saving a state whose nested list was mutated should write it."""
+        state = {"manifest_splits": ["01-a"]}
+        save_session_state(str(tmp_path), state)
+
+        state["manifest_splits"].append("02-b")
+        save_session_state(str(tmp_path), state)
+
+        assert json.loads((tmp_path / SESSION_FILENAME).read_bytes()) == {
+            "manifest_splits": ["01-a", "02-b"]
+        }
+
+    def test_skips_write_of_unchanged_state(self, tmp_path, monkeypatch):
+        """Saving a state equal to the one on disk should not rewrite the file."""
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+
+        def fail_write(path, content, **kwargs):
+            raise AssertionError("unchanged state was rewritten")
+
+        monkeypatch.setattr("lib.config._atomic_write", fail_write)
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+
+    def test_saves_over_same_tick_rewrite(self, tmp_path):
+        """A save should not be dropped when the file changed within the same tick."""
+        state_file = tmp_path / SESSION_FILENAME
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:aaa"})
+        st = state_file.stat()
+
+        state_file.write_bytes(state_file.read_bytes().replace(b"aaa", b"bbb"))
+        os.utime(state_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:aaa"})
+
+        assert json.loads(state_file.read_bytes()) == {"input_file_hash": "sha256:aaa"}
+
+    def test_rewrites_deleted_state(self, tmp_path):
+        """Saving should recreate the file if it was removed externally."""
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+        (tmp_path / SESSION_FILENAME).unlink()
+
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:abc"}
+
     def test_handles_corrupted_state(self, tmp_path):
         """Should raise ValueError for corrupted state file."""
-        (tmp_path / SESSION_FILENAME).write_text("not valid json")
+        (tmp_path / SESSION_FILENAME).write_bytes(CORRUPT_JSON)
 
         with pytest.raises(ValueError) as exc_info:
             load_session_state(str(tmp_path))
@@ -240,9 +425,50 @@ class TestSessionState:
         state = create_initial_session_state(str(input_file))
 
         # Only these fields should exist
-        assert set(state.keys()) == {"input_file_hash", "session_created_at"}
-        assert state["input_file_hash"].startswith("sha256:")
-        assert "session_created_at" in state
+        assert set(state.keys()) == {
+            "input_file_hash",
+            "input_file_mtime_ns",
+            "input_file_size",
+            "session_created_at",
+        }
+        assert state["input_file_hash"].startswith("blake2b:")
+        assert state["input_file_size"] == input_file.stat().st_size
+        assert state["input_file_mtime_ns"] == input_file.stat().st_mtime_ns
+        assert state["session_created_at"].endswith("+00:00")
+        assert "." not in state["session_created_at"]  # second precision
+
+
+class TestUpdateSessionState:
+    """Tests for field-level session state updates."""
+
+    def test_updates_changed_field(self, tmp_path):
+        """Should merge changed fields and keep the others."""
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc", "session_created_at": "t0"})
+
+        written = update_session_state(str(tmp_path), input_file_hash="sha256:def")
+
+        assert written is True
+        assert load_session_state(str(tmp_path)) == {
+            "input_file_hash": "sha256:def",
+            "session_created_at": "t0",
+        }
+
+    def test_skips_write_when_unchanged(self, tmp_path):
+        """Should not rewrite the file when no field changes."""
+        save_session_state(str(tmp_path), {"input_file_hash": "sha256:abc"})
+        inode_before = (tmp_path / SESSION_FILENAME).stat().st_ino
+
+        written = update_session_state(str(tmp_path), input_file_hash="sha256:abc")
+
+        assert written is False
+        assert (tmp_path / SESSION_FILENAME).stat().st_ino == inode_before
+
+    def test_creates_state_when_missing(self, tmp_path):
+        """Should create the state file if none exists."""
+        written = update_session_state(str(tmp_path), input_file_hash="sha256:abc")
+
+        assert written is True
+        assert load_session_state(str(tmp_path)) == {"input_file_hash": "sha256:abc"}
 
 
 class TestInputFileChanged:
@@ -251,7 +477,7 @@ class TestInputFileChanged:
     def test_detects_unchanged(self, tmp_path):
         """Should return False if file unchanged."""
         input_file = tmp_path / "requirements.md"
-        input_file.write_text("# Requirements")
+        input_file.write_bytes(b"# Requirements")
 
         # Create state with current hash
         state = create_initial_session_state(str(input_file))
@@ -264,14 +490,14 @@ class TestInputFileChanged:
     def test_detects_changed(self, tmp_path):
         """Should return True if file content changed."""
         input_file = tmp_path / "requirements.md"
-        input_file.write_text("# Original Requirements")
+        input_file.write_bytes(b"# Original Requirements")
 
         # Create state with original hash
         state = create_initial_session_state(str(input_file))
         save_session_state(str(tmp_path), state)
 
         # Modify the file
-        input_file.write_text("# Modified Requirements")
+        input_file.write_bytes(b"# Modified Requirements")
 
         result = check_input_file_changed(str(tmp_path), str(input_file))
 
@@ -280,27 +506,94 @@ class TestInputFileChanged:
     def test_returns_none_if_no_state(self, tmp_path):
         """Should return None if no previous state."""
         input_file = tmp_path / "requirements.md"
-        input_file.write_text("# Requirements")
+        input_file.write_bytes(b"# Requirements")
 
         result = check_input_file_changed(str(tmp_path), str(input_file))
 
         assert result is None
 
+    def test_skips_hash_when_stat_unchanged(self, tmp_path, monkeypatch):
+        """Should not hash the file when mtime and size match stored values."""
+        input_file = tmp_path / "requirements.md"
+        input_file.write_bytes(b"# Requirements")
+        save_session_state(str(tmp_path), create_initial_session_state(str(input_file)))
 
-class TestSessionFilenameEnum:
-    """Tests for SessionFilename StrEnum."""
+        def fail_hash(_path):
+            raise AssertionError("file should not be hashed")
+
+        monkeypatch.setattr("lib.config.compute_file_hash", fail_hash)
+
+        assert check_input_file_changed(str(tmp_path), str(input_file)) is False
+
+    def test_legacy_state_hashes_without_writing(self, tmp_path):
+        """State without stat fields should fall back to hashing, read-only."""
+        input_file = tmp_path / "requirements.md"
+        input_file.write_bytes(b"# Requirements")
+        legacy = {
+            "input_file_hash": compute_file_hash(str(input_file)),
+            "session_created_at": "2024-01-01T00:00:00Z",
+        }
+        save_session_state(str(tmp_path), legacy)
+
+        assert check_input_file_changed(str(tmp_path), str(input_file)) is False
+
+        assert load_session_state(str(tmp_path)) == legacy
+
+    def test_status_returns_fresh_stat(self, tmp_path):
+        """input_file_status should return the current stat fields."""
+        input_file = tmp_path / "requirements.md"
+        input_file.write_bytes(b"# Requirements")
+        state = {"input_file_hash": compute_file_hash(str(input_file))}
 
-    def test_state_value(self):
-        """STATE should be correct filename."""
-        assert SessionFilename.STATE == "deep_project_session.json"
+        changed, stat_fields = input_file_status(str(tmp_path), str(input_file), state)
 
-    def test_interview_value(self):
-        """INTERVIEW should be correct filename."""
-        assert SessionFilename.INTERVIEW == "deep_project_interview.md"
+        assert changed is False
+        assert stat_fields == {
+            "input_file_mtime_ns": input_file.stat().st_mtime_ns,
+            "input_file_size": input_file.stat().st_size,
+        }
+        assert not (tmp_path / "deep_project_session.json").exists()
+
+    def test_uses_passed_session_state(self, tmp_path, monkeypatch):
+        """Should not reload state the caller already has."""
+        input_file = tmp_path / "requirements.md"
+        input_file.write_bytes(b"# Requirements")
+        state = create_initial_session_state(str(input_file))
+
+        def fail_load(planning_dir):
+            raise AssertionError("session state was reloaded")
+
+        monkeypatch.setattr("lib.config.load_session_state", fail_load)
+
+        assert check_input_file_changed(str(tmp_path), str(input_file), state) is False
+
+    def test_legacy_sha256_hash_unchanged(self, tmp_path):
+        """A session recorded with a sha256 hash should not report a change."""
+        input_file = tmp_path / "requirements.md"
+        input_file.write_bytes(b"# Requirements")
+        save_session_state(str(tmp_path), {
+            "input_file_hash": compute_file_hash(str(input_file), "sha256"),
+            "session_created_at": "2024-01-01T00:00:00Z",
+        })
+
+        assert check_input_file_changed(str(tmp_path), str(input_file)) is False
+
+
+class TestSessionFilenameEnum:
+    """Tests for SessionFilename StrEnum."""
 
-    def test_manifest_value(self):
-        """MANIFEST should be correct filename."""
-        assert SessionFilename.MANIFEST == "project-manifest.md"
+    @pytest.mark.parametrize(
+        "member, expected",
+        [
+            (SessionFilename.STATE, "deep_project_session.json"),
+            (SessionFilename.INTERVIEW, "deep_project_interview.md"),
+            (SessionFilename.MANIFEST, "project-manifest.md"),
+        ],
+    )
+    def test_enum_value(self, member, expected):
+        """Each member should be its filename, as a str."""
+        assert member == expected
+        assert isinstance(member, str)
 
     def test_is_string(self):
         """StrEnum values should be usable as strings."""
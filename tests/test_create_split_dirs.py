@@ -1,157 +1,117 @@
 # tests/test_create_split_dirs.py
 """Tests for create-split-dirs.py script."""
 
+import importlib.util
 import json
 import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
 
-def run_create_split_dirs(planning_dir: Path) -> dict:
-    """Helper to run create-split-dirs.py and return parsed output."""
-    result = subprocess.run(
-        [
-            "uv", "run", "scripts/checks/create-split-dirs.py",
-            "--planning-dir", str(planning_dir)
-        ],
-        capture_output=True,
-        text=True,
-        cwd=Path(__file__).parent.parent
-    )
-    return json.loads(result.stdout)
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "checks" / "create-split-dirs.py"
 
+_spec = importlib.util.spec_from_file_location("create_split_dirs", SCRIPT_PATH)
+create_split_dirs_script = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(create_split_dirs_script)
 
-@pytest.mark.integration
-class TestCreateSplitDirs:
-    """Integration tests for create-split-dirs.py."""
 
-    def test_creates_directories_from_manifest(self, tmp_path):
-        """Should create directories listed in manifest."""
-        # Create manifest with valid SPLIT_MANIFEST block
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
+# Canonical two-split manifest
+_MANIFEST_BYTES = b"""<!-- SPLIT_MANIFEST
 01-backend
 02-frontend
-END_MANIFEST -->
-
-# Project Manifest
-""")
+END_MANIFEST -->"""
 
-        output = run_create_split_dirs(tmp_path)
 
-        assert output["success"] is True
-        assert output["created"] == ["01-backend", "02-frontend"]
-        assert output["skipped"] == []
-        assert (tmp_path / "01-backend").is_dir()
-        assert (tmp_path / "02-frontend").is_dir()
-
-    def test_skips_existing_directories(self, tmp_path):
-        """Should skip directories that already exist."""
-        # Create manifest
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
-01-backend
-02-frontend
-END_MANIFEST -->""")
-
-        # Pre-create one directory
-        (tmp_path / "01-backend").mkdir()
-
-        output = run_create_split_dirs(tmp_path)
+def run_create_split_dirs(planning_dir: Path) -> dict:
+    """Helper to run create-split-dirs.py in-process and return its result."""
+    args = create_split_dirs_script.build_parser().parse_args(
+        ["--planning-dir", str(planning_dir)]
+    )
+    return create_split_dirs_script.run(args)
+
+
+# (manifest, pre-created dirs, expected created, expected skipped)
+_SUCCESS_CASES = [
+    pytest.param(
+        _MANIFEST_BYTES + b"\n\n# Project Manifest\n",
+        [], ["01-backend", "02-frontend"], [],
+        id="creates-directories-from-manifest",
+    ),
+    pytest.param(
+        _MANIFEST_BYTES,
+        ["01-backend"], ["02-frontend"], ["01-backend"],
+        id="skips-existing-directories",
+    ),
+    pytest.param(
+        _MANIFEST_BYTES,
+        ["01-backend", "02-frontend"], [], ["01-backend", "02-frontend"],
+        id="all-directories-exist",
+    ),
+    pytest.param(
+        b"<!-- SPLIT_MANIFEST\n01-my-project\nEND_MANIFEST -->",
+        [], ["01-my-project"], [],
+        id="single-split-project",
+    ),
+    pytest.param(
+        b"<!-- SPLIT_MANIFEST\n01-backend\n02-frontend\n03-shared\nEND_MANIFEST -->",
+        [], ["01-backend", "02-frontend", "03-shared"], [],
+        id="three-splits",
+    ),
+]
+
+# (manifest or None for no file, planning dir name under tmp_path, error text)
+_FAILURE_CASES = [
+    pytest.param(None, "", "manifest file not found", id="without-manifest"),
+    pytest.param(
+        b"# No SPLIT_MANIFEST block here", "", "no split_manifest block",
+        id="invalid-manifest",
+    ),
+    pytest.param(
+        b"<!-- SPLIT_MANIFEST\n1-bad-prefix\nEND_MANIFEST -->", "", "invalid split name",
+        id="invalid-split-names",
+    ),
+    pytest.param(None, "nonexistent", "planning directory not found", id="nonexistent-planning-dir"),
+]
 
-        assert output["success"] is True
-        assert output["created"] == ["02-frontend"]
-        assert output["skipped"] == ["01-backend"]
 
-    def test_all_directories_exist(self, tmp_path):
-        """Should report all skipped when all dirs exist."""
-        # Create manifest
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
-01-backend
-02-frontend
-END_MANIFEST -->""")
+@pytest.mark.integration
+class TestCreateSplitDirs:
+    """Integration tests for create-split-dirs.py."""
 
-        # Pre-create all directories
-        (tmp_path / "01-backend").mkdir()
-        (tmp_path / "02-frontend").mkdir()
+    @pytest.mark.parametrize("manifest, pre_created, created, skipped", _SUCCESS_CASES)
+    def test_creates_missing_directories(self, tmp_path, manifest, pre_created, created, skipped):
+        """Should create the manifest's missing dirs and skip existing ones."""
+        (tmp_path / "project-manifest.md").write_bytes(manifest)
+        for name in pre_created:
+            (tmp_path / name).mkdir()
 
         output = run_create_split_dirs(tmp_path)
 
         assert output["success"] is True
-        assert output["created"] == []
-        assert output["skipped"] == ["01-backend", "02-frontend"]
-
-    def test_fails_without_manifest(self, tmp_path):
-        """Should fail when manifest doesn't exist."""
-        output = run_create_split_dirs(tmp_path)
-
-        assert output["success"] is False
-        assert "not found" in output["error"].lower() or "errors" in output
-
-    def test_fails_with_invalid_manifest(self, tmp_path):
-        """Should fail when manifest has invalid format."""
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("# No SPLIT_MANIFEST block here")
-
-        output = run_create_split_dirs(tmp_path)
+        assert output["created"] == created
+        assert output["skipped"] == skipped
+        assert output["manifest_splits"] == sorted(created + skipped)
+        for name in created:
+            assert (tmp_path / name).is_dir()
 
-        assert output["success"] is False
-        assert "errors" in output or "error" in output
+    @pytest.mark.parametrize("manifest, dir_name, error_text", _FAILURE_CASES)
+    def test_fails(self, tmp_path, manifest, dir_name, error_text):
+        """Should fail with a descriptive error."""
+        if manifest is not None:
+            (tmp_path / "project-manifest.md").write_bytes(manifest)
 
-    def test_fails_with_invalid_split_names(self, tmp_path):
-        """Should fail when manifest has invalid split names."""
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
-1-bad-prefix
-END_MANIFEST -->""")
-
-        output = run_create_split_dirs(tmp_path)
+        output = run_create_split_dirs(tmp_path / dir_name)
 
         assert output["success"] is False
-        assert "errors" in output
-
-    def test_fails_with_nonexistent_planning_dir(self, tmp_path):
-        """Should fail when planning directory doesn't exist."""
-        nonexistent = tmp_path / "nonexistent"
-
-        output = run_create_split_dirs(nonexistent)
-
-        assert output["success"] is False
-        assert "not found" in output["error"].lower()
-
-    def test_single_split_project(self, tmp_path):
-        """Should handle single-split projects."""
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
-01-my-project
-END_MANIFEST -->""")
-
-        output = run_create_split_dirs(tmp_path)
-
-        assert output["success"] is True
-        assert output["created"] == ["01-my-project"]
-        assert (tmp_path / "01-my-project").is_dir()
-
-    def test_returns_manifest_splits_list(self, tmp_path):
-        """Should return full manifest_splits list in output."""
-        manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
-01-backend
-02-frontend
-03-shared
-END_MANIFEST -->""")
-
-        output = run_create_split_dirs(tmp_path)
-
-        assert output["success"] is True
-        assert output["manifest_splits"] == ["01-backend", "02-frontend", "03-shared"]
+        messages = [output["error"], *output.get("errors", [])]
+        assert error_text in " ".join(messages).lower()
 
     def test_json_output_format(self, tmp_path):
         """Should return valid JSON with expected fields."""
         manifest = tmp_path / "project-manifest.md"
-        manifest.write_text("""<!-- SPLIT_MANIFEST
+        manifest.write_bytes(b"""<!-- SPLIT_MANIFEST
 01-backend
 END_MANIFEST -->""")
 
@@ -162,3 +122,34 @@ END_MANIFEST -->""")
         assert "skipped" in output
         assert "manifest_splits" in output
         assert "message" in output
+
+
+@pytest.mark.integration
+class TestCreateSplitDirsScript:
+    """Smoke tests for create-split-dirs.py run as a script."""
+
+    def test_cli_outputs_json(self, tmp_path):
+        """Should print the result as JSON and exit 0 on success."""
+        (tmp_path / "project-manifest.md").write_bytes(b"""<!-- SPLIT_MANIFEST
+01-backend
+END_MANIFEST -->""")
+
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT_PATH), "--planning-dir", str(tmp_path)],
+            capture_output=True,
+            cwd=Path(__file__).parent.parent
+        )
+
+        assert result.returncode == 0
+        assert json.loads(result.stdout)["created"] == ["01-backend"]
+
+    def test_cli_exits_nonzero_on_failure(self, tmp_path):
+        """Should exit 1 when the result is unsuccessful."""
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT_PATH), "--planning-dir", str(tmp_path / "missing")],
+            capture_output=True,
+            cwd=Path(__file__).parent.parent
+        )
+
+        assert result.returncode == 1
+        assert json.loads(result.stdout)["success"] is False
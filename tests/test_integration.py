@@ -4,30 +4,24 @@
 Design principle: State is derived from file existence, not JSON fields.
 """
 
+import importlib.util
 import json
-import subprocess
-import sys
+import os
+import shutil
 from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 from lib.config import (
     compute_file_hash,
+    load_session_state,
     save_session_state,
 )
 from lib.state import detect_state
 
 
-@pytest.fixture
-def integration_planning_dir(tmp_path):
-    """Create a full planning directory for integration tests."""
-    planning_dir = tmp_path / "planning"
-    planning_dir.mkdir()
-
-    # Create sample input file
-    input_file = planning_dir / "rough_plan.md"
-    input_file.write_text("""
+# Requirements file written into every integration planning dir
+ROUGH_PLAN_TEXT = """
 # My Project Requirements
 
 ## Overview
@@ -37,29 +31,52 @@ Build a web application with backend API and frontend UI.
 - User authentication
 - Dashboard
 - Data visualization
-""")
+"""
+
+
+@pytest.fixture(scope="session")
+def _planning_template(tmp_path_factory):
+    """Build the clean planning directory once per session (read-only)."""
+    planning_dir = tmp_path_factory.mktemp("templates") / "planning"
+    planning_dir.mkdir()
+
+    # Create sample input file
+    (planning_dir / "rough_plan.md").write_text(ROUGH_PLAN_TEXT)
 
     return planning_dir
 
 
+@pytest.fixture(scope="session")
+def rough_plan_hash(_planning_template):
+    """Content hash of ROUGH_PLAN_TEXT, computed once per session."""
+    return compute_file_hash(str(_planning_template / "rough_plan.md"))
+
+
+@pytest.fixture
+def integration_planning_dir(tmp_path, _planning_template):
+    """Create a full planning directory for integration tests."""
+    return Path(shutil.copytree(_planning_template, tmp_path / "planning"))
+
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "checks" / "setup-session.py"
+
+_spec = importlib.util.spec_from_file_location("setup_session", SCRIPT_PATH)
+setup_session_script = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(setup_session_script)
+
+
 def run_setup_session(
     input_file: Path,
     plugin_root: Path,
     session_id: str = "test-session-12345",
 ) -> dict:
-    """Helper to run setup-session.py and return parsed output."""
-    result = subprocess.run(
-        [
-            "uv", "run", "scripts/checks/setup-session.py",
-            "--file", str(input_file),
-            "--plugin-root", str(plugin_root),
-            "--session-id", session_id,
-        ],
-        capture_output=True,
-        text=True,
-        cwd=Path(__file__).parent.parent
-    )
-    return json.loads(result.stdout)
+    """Helper to run setup-session.py in-process and return its result."""
+    args = setup_session_script.build_parser().parse_args([
+        "--file", str(input_file),
+        "--plugin-root", str(plugin_root),
+        "--session-id", session_id,
+    ])
+    return setup_session_script.run(args)
 
 
 @pytest.mark.integration
@@ -89,7 +106,7 @@ class TestEndToEnd:
         assert state_path.exists()
 
         state = json.loads(state_path.read_text())
-        assert state["input_file_hash"].startswith("sha256:")
+        assert state["input_file_hash"].startswith("blake2b:")
         assert "session_created_at" in state
         # Should NOT have old fields
         assert "proposed_splits" not in state
@@ -97,7 +114,7 @@ class TestEndToEnd:
         assert "splits_confirmed" not in state
         assert "completion_status" not in state
 
-    def test_resume_after_interview(self, integration_planning_dir, mock_plugin_root):
+    def test_resume_after_interview(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
         """Resume correctly after interview phase.
 
         Simulates:
@@ -112,7 +129,7 @@ class TestEndToEnd:
 
         # Create minimal session state
         save_session_state(str(integration_planning_dir), {
-            "input_file_hash": compute_file_hash(str(input_file)),
+            "input_file_hash": rough_plan_hash,
             "session_created_at": "2024-01-19T10:30:00Z",
         })
 
@@ -131,7 +148,34 @@ User indicated backend and frontend as natural splits.
         assert output["resume_from_step"] == 2
         assert output["state"]["interview_complete"] is True
 
-    def test_resume_after_user_confirmed(self, integration_planning_dir, mock_plugin_root):
+    def test_resume_after_manifest_reports_needed_dirs(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
+        """Manifest written but not confirmed: report dirs, don't create them.
+
+        Verifies:
+        - resume_from_step=4 (user confirmation)
+        - manifest_splits / splits_needing_dirs list the manifest splits
+        - No split directories are created before confirmation
+        """
+        input_file = integration_planning_dir / "rough_plan.md"
+
+        save_session_state(str(integration_planning_dir), {
+            "input_file_hash": rough_plan_hash,
+            "session_created_at": "2024-01-19T10:30:00Z",
+        })
+        (integration_planning_dir / "deep_project_interview.md").write_text("# Interview")
+        (integration_planning_dir / "project-manifest.md").write_text("""<!-- SPLIT_MANIFEST
+01-backend
+02-frontend
+END_MANIFEST -->""")
+
+        output = run_setup_session(input_file, mock_plugin_root)
+
+        assert output["resume_from_step"] == 4
+        assert output["manifest_splits"] == ["01-backend", "02-frontend"]
+        assert output["splits_needing_dirs"] == ["01-backend", "02-frontend"]
+        assert not (integration_planning_dir / "01-backend").exists()
+
+    def test_resume_after_user_confirmed(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
         """Resume correctly after user confirmed splits.
 
         Simulates:
@@ -145,7 +189,7 @@ User indicated backend and frontend as natural splits.
 
         # Create minimal session state
         save_session_state(str(integration_planning_dir), {
-            "input_file_hash": compute_file_hash(str(input_file)),
+            "input_file_hash": rough_plan_hash,
             "session_created_at": "2024-01-19T10:30:00Z",
         })
 
@@ -163,7 +207,7 @@ User indicated backend and frontend as natural splits.
         assert output["resume_from_step"] == 6
         assert output["state"]["directories_created"] is True
 
-    def test_single_unit_workflow(self, integration_planning_dir, mock_plugin_root):
+    def test_single_unit_workflow(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
         """Not-splittable project creates single subdir.
 
         Simulates:
@@ -176,7 +220,7 @@ User indicated backend and frontend as natural splits.
 
         # Create minimal session state
         save_session_state(str(integration_planning_dir), {
-            "input_file_hash": compute_file_hash(str(input_file)),
+            "input_file_hash": rough_plan_hash,
             "session_created_at": "2024-01-19T10:30:00Z",
         })
 
@@ -194,7 +238,7 @@ User indicated backend and frontend as natural splits.
         assert output["mode"] == "resume"
         assert output["resume_from_step"] == 7
 
-    def test_output_structure(self, integration_planning_dir, mock_plugin_root):
+    def test_output_structure(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
         """Verify final output structure matches spec.
 
         Complete workflow produces:
@@ -207,7 +251,7 @@ User indicated backend and frontend as natural splits.
 
         # Create minimal session state
         save_session_state(str(integration_planning_dir), {
-            "input_file_hash": compute_file_hash(str(input_file)),
+            "input_file_hash": rough_plan_hash,
             "session_created_at": "2024-01-19T10:30:00Z",
         })
 
@@ -225,11 +269,11 @@ User indicated backend and frontend as natural splits.
         # Verify structure using detect_state
         state = detect_state(integration_planning_dir)
 
-        assert state["interview_complete"] is True
-        assert state["directories_created"] is True
-        assert state["resume_step"] == 7
-        assert state["splits"] == ["01-backend", "02-frontend"]
-        assert state["splits_with_specs"] == ["01-backend", "02-frontend"]
+        assert state.interview_complete is True
+        assert state.directories_created is True
+        assert state.resume_step == 7
+        assert state.splits == ("01-backend", "02-frontend")
+        assert state.splits_with_specs == ("01-backend", "02-frontend")
 
 
 @pytest.mark.integration
@@ -263,7 +307,43 @@ class TestEdgeCases:
         # Now should detect change
         assert check_input_file_changed(str(integration_planning_dir), str(input_file)) is True
 
-    def test_partial_completion_resume(self, integration_planning_dir, mock_plugin_root):
+    def test_resume_records_input_file_stat(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
+        """Resuming a legacy session should store the input file's stat."""
+        input_file = integration_planning_dir / "rough_plan.md"
+        save_session_state(str(integration_planning_dir), {
+            "input_file_hash": rough_plan_hash,
+            "session_created_at": "2024-01-19T10:30:00Z",
+        })
+
+        output = run_setup_session(input_file, mock_plugin_root)
+
+        assert output["warnings"] == []
+        state = load_session_state(str(integration_planning_dir))
+        assert state["input_file_mtime_ns"] == input_file.stat().st_mtime_ns
+        assert state["input_file_size"] == input_file.stat().st_size
+
+    def test_resume_records_manifest_splits(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
+        """Resuming with an unrecorded manifest should store its parsed splits."""
+        input_file = integration_planning_dir / "rough_plan.md"
+        save_session_state(str(integration_planning_dir), {
+            "input_file_hash": rough_plan_hash,
+            "session_created_at": "2024-01-19T10:30:00Z",
+        })
+        manifest = integration_planning_dir / "project-manifest.md"
+        manifest.write_text("""<!-- SPLIT_MANIFEST
+01-backend
+02-frontend
+END_MANIFEST -->""")
+        os.utime(manifest, ns=(1_000_000_000, 1_000_000_000))
+
+        output = run_setup_session(input_file, mock_plugin_root)
+
+        assert output["manifest_splits"] == ["01-backend", "02-frontend"]
+        state = load_session_state(str(integration_planning_dir))
+        assert state["manifest_splits"] == ["01-backend", "02-frontend"]
+        assert state["manifest_mtime_ns"] == 1_000_000_000
+
+    def test_partial_completion_resume(self, integration_planning_dir, mock_plugin_root, rough_plan_hash):
         """Should resume correctly when some specs written but not all.
 
         If directories exist but only some have spec.md files,
@@ -273,7 +353,7 @@ class TestEdgeCases:
 
         # Create minimal session state
         save_session_state(str(integration_planning_dir), {
-            "input_file_hash": compute_file_hash(str(input_file)),
+            "input_file_hash": rough_plan_hash,
             "session_created_at": "2024-01-19T10:30:00Z",
         })
 
@@ -318,4 +398,4 @@ class TestEdgeCases:
 
         # detect_state should only see 01-backend
         state = detect_state(integration_planning_dir)
-        assert state["splits"] == ["01-backend"]
+        assert state.splits == ("01-backend",)
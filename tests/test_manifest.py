@@ -1,13 +1,19 @@
 # tests/test_manifest.py
 """Tests for manifest parsing module."""
 
-import sys
-from pathlib import Path
+import os
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-from lib.manifest import parse_manifest, ParsedManifest, MANIFEST_BLOCK_PATTERN
+from lib.config import load_session_state, save_session_state, update_session_state
+from lib.manifest import (
+    create_split_dirs,
+    load_manifest,
+    manifest_status,
+    parse_manifest,
+    ParsedManifest,
+    MANIFEST_BLOCK_PATTERN,
+)
 
 
 class TestParsedManifest:
@@ -36,7 +42,7 @@ class TestManifestBlockPattern:
 
     def test_matches_valid_block(self):
         """Should match valid SPLIT_MANIFEST block."""
-        content = """<!-- SPLIT_MANIFEST
+        content = b"""<!-- SPLIT_MANIFEST
 01-backend
 02-frontend
 END_MANIFEST -->
@@ -45,12 +51,12 @@ END_MANIFEST -->
 """
         match = MANIFEST_BLOCK_PATTERN.search(content)
         assert match is not None
-        assert "01-backend" in match.group(1)
-        assert "02-frontend" in match.group(1)
+        assert b"01-backend" in match.group(1)
+        assert b"02-frontend" in match.group(1)
 
     def test_matches_with_extra_whitespace(self):
         """Should match block with varying whitespace."""
-        content = """<!--  SPLIT_MANIFEST
+        content = b"""<!--  SPLIT_MANIFEST
 01-backend
 END_MANIFEST  -->"""
         match = MANIFEST_BLOCK_PATTERN.search(content)
@@ -58,7 +64,7 @@ END_MANIFEST  -->"""
 
     def test_no_match_without_block(self):
         """Should not match content without block."""
-        content = "# Project Manifest\n\nNo block here."
+        content = b"# Project Manifest\n\nNo block here."
         match = MANIFEST_BLOCK_PATTERN.search(content)
         assert match is None
 
@@ -230,3 +236,168 @@ END_MANIFEST -->""")
             "02-user-management-service",
             "03-auth"
         ]
+
+    def test_reparses_after_file_changes(self, tmp_path):
+        """Cached result should be invalidated when the manifest changes."""
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text("""<!-- SPLIT_MANIFEST
+01-backend
+END_MANIFEST -->""")
+        assert parse_manifest(manifest).splits == ["01-backend"]
+
+        manifest.write_text("""<!-- SPLIT_MANIFEST
+01-backend
+02-frontend
+END_MANIFEST -->""")
+        assert parse_manifest(manifest).splits == ["01-backend", "02-frontend"]
+
+    def test_reparses_same_size_rewrite_in_racy_window(self, tmp_path):
+        """A same-size rewrite with an unchanged mtime should still be seen."""
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text("<!-- SPLIT_MANIFEST\n01-aaa\nEND_MANIFEST -->")
+        mtime_ns = manifest.stat().st_mtime_ns
+        assert parse_manifest(manifest).splits == ["01-aaa"]
+
+        manifest.write_text("<!-- SPLIT_MANIFEST\n01-bbb\nEND_MANIFEST -->")
+        os.utime(manifest, ns=(mtime_ns, mtime_ns))
+
+        assert parse_manifest(manifest).splits == ["01-bbb"]
+
+    def test_cached_result_is_not_shared(self, tmp_path):
+        """Mutating a returned splits list should not affect later results."""
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text("<!-- SPLIT_MANIFEST\n01-backend\nEND_MANIFEST -->")
+        os.utime(manifest, ns=(1_000_000_000, 1_000_000_000))
+
+        parse_manifest(manifest).splits.append("02-extra")
+
+        assert parse_manifest(manifest).splits == ["01-backend"]
+
+    def test_large_manifest(self, tmp_path):
+        """Should find the block in a manifest larger than the mmap threshold."""
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text("# Notes\n" + "x" * 8192 + """
+<!-- SPLIT_MANIFEST
+01-backend
+02-frontend
+END_MANIFEST -->
+""")
+
+        result = parse_manifest(manifest)
+
+        assert result.is_valid
+        assert result.splits == ["01-backend", "02-frontend"]
+
+
+class TestCreateSplitDirsHelper:
+    """Tests for create_split_dirs helper."""
+
+    def test_creates_missing_and_skips_existing(self, tmp_path):
+        """Should create new split dirs and report existing ones as skipped."""
+        (tmp_path / "01-backend").mkdir()
+
+        created, skipped = create_split_dirs(tmp_path, ["01-backend", "02-frontend"])
+
+        assert created == ["02-frontend"]
+        assert skipped == ["01-backend"]
+        assert (tmp_path / "02-frontend").is_dir()
+
+    def test_preserves_manifest_order(self, tmp_path):
+        """Should report names in the order given."""
+        created, skipped = create_split_dirs(tmp_path, ["02-b", "01-a"])
+
+        assert created == ["02-b", "01-a"]
+        assert skipped == []
+
+
+class TestLoadManifest:
+    """Tests for load_manifest and manifest_status, which reuse splits recorded in session state."""
+
+    MANIFEST = """<!-- SPLIT_MANIFEST
+01-backend
+02-frontend
+END_MANIFEST -->"""
+
+    def _record(self, tmp_path):
+        """Write an aged manifest and persist its fields as setup-session does."""
+        save_session_state(tmp_path, {"input_file_hash": "sha256:abc"})
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text(self.MANIFEST)
+        os.utime(manifest, ns=(1_000_000_000, 1_000_000_000))
+        _, fields = manifest_status(tmp_path)
+        update_session_state(tmp_path, **fields)
+        return manifest
+
+    def test_returns_fields_to_record(self, tmp_path):
+        """Should return parsed splits and manifest stat when a session exists."""
+        save_session_state(tmp_path, {"input_file_hash": "sha256:abc"})
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text(self.MANIFEST)
+        os.utime(manifest, ns=(1_000_000_000, 1_000_000_000))
+
+        result, fields = manifest_status(tmp_path)
+
+        assert result.splits == ["01-backend", "02-frontend"]
+        assert fields == {
+            "manifest_splits": ["01-backend", "02-frontend"],
+            "manifest_mtime_ns": manifest.stat().st_mtime_ns,
+            "manifest_size": manifest.stat().st_size,
+        }
+
+    def test_does_not_write_session_state(self, tmp_path):
+        """Loading should leave the session file untouched."""
+        save_session_state(tmp_path, {"input_file_hash": "sha256:abc"})
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text(self.MANIFEST)
+        os.utime(manifest, ns=(1_000_000_000, 1_000_000_000))
+
+        assert load_manifest(tmp_path).is_valid
+        assert load_session_state(tmp_path) == {"input_file_hash": "sha256:abc"}
+
+    def test_reuses_recorded_splits(self, tmp_path, monkeypatch):
+        """Should not parse again while the manifest stat matches."""
+        self._record(tmp_path)
+
+        def fail(path):
+            raise AssertionError("manifest was reparsed")
+
+        monkeypatch.setattr("lib.manifest.parse_manifest", fail)
+        assert load_manifest(tmp_path).splits == ["01-backend", "02-frontend"]
+        assert manifest_status(tmp_path)[1] == {}
+
+    def test_reparses_when_manifest_changes(self, tmp_path):
+        """Should parse again once the manifest's size or mtime changes."""
+        manifest = self._record(tmp_path)
+
+        manifest.write_text(self.MANIFEST.replace("02-frontend\n", "02-frontend\n03-shared\n"))
+
+        assert load_manifest(tmp_path).splits == ["01-backend", "02-frontend", "03-shared"]
+
+    def test_does_not_record_racy_manifest(self, tmp_path):
+        """A manifest written within the racy window should not be recorded."""
+        save_session_state(tmp_path, {"input_file_hash": "sha256:abc"})
+        (tmp_path / "project-manifest.md").write_text(self.MANIFEST)
+
+        result, fields = manifest_status(tmp_path)
+
+        assert result.splits == ["01-backend", "02-frontend"]
+        assert fields == {}
+
+    def test_nothing_to_record_without_session(self, tmp_path):
+        """Should return no fields when no session exists."""
+        manifest = tmp_path / "project-manifest.md"
+        manifest.write_text(self.MANIFEST)
+        os.utime(manifest, ns=(1_000_000_000, 1_000_000_000))
+
+        result, fields = manifest_status(tmp_path)
+
+        assert result.is_valid
+        assert fields == {}
+        assert load_session_state(tmp_path) is None
+
+    def test_missing_manifest(self, tmp_path):
+        """Should return an error result when the manifest does not exist."""
+        result = load_manifest(tmp_path)
+
+        assert not result.is_valid
+        assert "not found" in result.errors[0].lower()
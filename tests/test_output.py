@@ -0,0 +1,36 @@
+# tests/test_output.py
+"""Tests for JSON output helpers."""
+
+import json
+
+from lib.output import dumps_json, emit_json
+
+
+class TestDumpsJson:
+    """Tests for dumps_json serialization."""
+
+    def test_compact_by_default(self):
+        """Default output should contain no insignificant whitespace."""
+        assert dumps_json({"a": 1, "b": [1, 2]}) == '{"a":1,"b":[1,2]}'
+
+    def test_pretty_indents(self):
+        """pretty=True should indent with two spaces."""
+        assert dumps_json({"a": 1}, pretty=True) == '{\n  "a": 1\n}'
+
+
+class TestEmitJson:
+    """Tests for emit_json stdout output."""
+
+    def test_writes_parseable_line(self, capsys):
+        """Should write one JSON document followed by a newline."""
+        emit_json({"success": True})
+
+        out = capsys.readouterr().out
+        assert out.endswith("\n")
+        assert json.loads(out) == {"success": True}
+
+    def test_escapes_non_ascii(self, capsys):
+        """Non-ASCII values should round-trip through the escaped output."""
+        emit_json({"path": "/tmp/plän"})
+
+        assert json.loads(capsys.readouterr().out) == {"path": "/tmp/plän"}
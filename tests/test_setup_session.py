@@ -3,13 +3,23 @@
 Design principle: State is derived from file existence, not JSON fields.
 """
 
+import importlib.util
 import json
+import os
 import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
 
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "checks" / "setup-session.py"
+
+_spec = importlib.util.spec_from_file_location("setup_session", SCRIPT_PATH)
+setup_session = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(setup_session)
+
+
 class TestValidateInputFile:
     """Tests for input file validation."""
 
@@ -19,13 +29,12 @@ class TestValidateInputFile:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(input_file),
                 "--plugin-root", str(mock_plugin_root),
                 "--session-id", mock_session_id,
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -37,12 +46,11 @@ class TestValidateInputFile:
         """Should reject missing file."""
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(tmp_path / "nonexistent.md"),
                 "--plugin-root", str(mock_plugin_root)
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -57,12 +65,30 @@ class TestValidateInputFile:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(empty_file),
                 "--plugin-root", str(mock_plugin_root)
             ],
             capture_output=True,
-            text=True,
+            cwd=Path(__file__).parent.parent
+        )
+
+        output = json.loads(result.stdout)
+        assert output["success"] is False
+        assert "empty" in output["error"].lower()
+
+    def test_rejects_whitespace_only(self, tmp_path, mock_plugin_root):
+        """Should reject file containing only whitespace."""
+        blank_file = tmp_path / "blank.md"
+        blank_file.write_text("  \n\t\n")
+
+        result = subprocess.run(
+            [
+                sys.executable, "scripts/checks/setup-session.py",
+                "--file", str(blank_file),
+                "--plugin-root", str(mock_plugin_root)
+            ],
+            capture_output=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -77,12 +103,11 @@ class TestValidateInputFile:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(txt_file),
                 "--plugin-root", str(mock_plugin_root)
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -97,12 +122,11 @@ class TestValidateInputFile:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(dir_path),
                 "--plugin-root", str(mock_plugin_root)
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -110,6 +134,67 @@ class TestValidateInputFile:
         assert output["success"] is False
         assert "directory" in output["error"].lower()
 
+    @pytest.mark.parametrize("case", ["parent_is_file", "symlink_loop"])
+    def test_unreachable_path_reports_not_found(self, tmp_path, mock_plugin_root, case):
+        """Should report a path that cannot resolve as not found."""
+        if case == "parent_is_file":
+            (tmp_path / "plainfile").write_text("not a directory")
+            file_path = tmp_path / "plainfile" / "plan.md"
+        else:
+            file_path = tmp_path / "loop.md"
+            os.symlink(file_path, file_path)
+
+        result = subprocess.run(
+            [
+                sys.executable, "scripts/checks/setup-session.py",
+                "--file", str(file_path),
+                "--plugin-root", str(mock_plugin_root)
+            ],
+            capture_output=True,
+            cwd=Path(__file__).parent.parent
+        )
+
+        output = json.loads(result.stdout)
+        assert output["success"] is False
+        assert output["error"] == f"File not found: {file_path}"
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+    def test_rejects_fifo(self, tmp_path, mock_plugin_root):
+        """Should reject a FIFO without blocking on it."""
+        fifo_path = tmp_path / "plan.md"
+        os.mkfifo(fifo_path)
+
+        result = subprocess.run(
+            [
+                sys.executable, "scripts/checks/setup-session.py",
+                "--file", str(fifo_path),
+                "--plugin-root", str(mock_plugin_root)
+            ],
+            capture_output=True,
+            cwd=Path(__file__).parent.parent,
+            timeout=30,
+        )
+
+        output = json.loads(result.stdout)
+        assert output["success"] is False
+        assert "regular file" in output["error"]
+
+
+class TestPreallocateFdTable:
+    """Tests for preallocate_fd_table."""
+
+    def test_leaves_open_descriptor_alone(self, tmp_path):
+        """An fd already open at the target number should stay open."""
+        high_fd = 900
+        with open(tmp_path / "held.txt", "wb") as f:
+            os.dup2(f.fileno(), high_fd)
+        try:
+            setup_session.preallocate_fd_table(high_fd)
+
+            os.fstat(high_fd)  # Raises EBADF if it was closed
+        finally:
+            os.close(high_fd)
+
 
 @pytest.mark.integration
 class TestSetupSessionScript:
@@ -121,13 +206,12 @@ class TestSetupSessionScript:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(input_file),
                 "--plugin-root", str(mock_plugin_root),
                 "--session-id", mock_session_id,
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -150,13 +234,12 @@ class TestSetupSessionScript:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(input_file),
                 "--plugin-root", str(mock_plugin_root),
                 "--session-id", mock_session_id,
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -171,13 +254,12 @@ class TestSetupSessionScript:
         # First run to create session
         subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(input_file),
                 "--plugin-root", str(mock_plugin_root),
                 "--session-id", mock_session_id,
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -190,13 +272,12 @@ class TestSetupSessionScript:
         # Second run should detect change
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(input_file),
                 "--plugin-root", str(mock_plugin_root),
                 "--session-id", mock_session_id,
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -213,13 +294,12 @@ class TestSetupSessionScript:
 
         result = subprocess.run(
             [
-                "uv", "run", "scripts/checks/setup-session.py",
+                sys.executable, "scripts/checks/setup-session.py",
                 "--file", str(input_file),
                 "--plugin-root", str(mock_plugin_root),
                 "--session-id", mock_session_id,
             ],
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent
         )
 
@@ -240,3 +320,23 @@ class TestSetupSessionScript:
         assert "tasks_written" in output
         assert "task_list_id" in output
         assert "session_id_source" in output
+
+    def test_preallocate_fds_flag(self, tmp_planning_dir, mock_plugin_root, mock_session_id):
+        """--preallocate-fds should not change the result."""
+        input_file = tmp_planning_dir / "rough_plan.md"
+
+        result = subprocess.run(
+            [
+                sys.executable, "scripts/checks/setup-session.py",
+                "--file", str(input_file),
+                "--plugin-root", str(mock_plugin_root),
+                "--session-id", mock_session_id,
+                "--preallocate-fds",
+            ],
+            capture_output=True,
+            cwd=Path(__file__).parent.parent
+        )
+
+        output = json.loads(result.stdout)
+        assert output["success"] is True
+        assert output["mode"] == "new"
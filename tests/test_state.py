@@ -5,11 +5,10 @@ Design principle: State is derived from file existence, not JSON fields.
 """
 
 import json
+import os
 import pytest
-from pathlib import Path
+from dataclasses import FrozenInstanceError
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 from lib.state import (
     is_valid_split_dir,
     get_split_index,
@@ -17,6 +16,7 @@ from lib.state import (
     generate_todos,
     STEPS,
     SPLIT_DIR_PATTERN,
+    SPLIT_LINE_PATTERN,
 )
 
 
@@ -49,6 +49,16 @@ class TestSplitDirValidation:
         assert is_valid_split_dir("01-na.me") is False
         assert is_valid_split_dir("01-na me") is False
 
+    def test_rejects_non_ascii_digits(self):
+        """Should reject prefixes made of non-ASCII digits."""
+        assert is_valid_split_dir("\u0660\u0661-name") is False
+
+    def test_line_pattern_finds_valid_lines_only(self):
+        """SPLIT_LINE_PATTERN should pick valid names out of a line list in order."""
+        block = "01-backend\n1-bad\n02-front-end\n03-Upper\n04-x"
+
+        assert SPLIT_LINE_PATTERN.findall(block) == ["01-backend", "02-front-end", "04-x"]
+
 
 class TestGetSplitIndex:
     """Tests for extracting numeric index."""
@@ -67,10 +77,10 @@ class TestDetectState:
         """Empty dir should return resume_step=1."""
         state = detect_state(tmp_path)
 
-        assert state["interview_complete"] is False
-        assert state["manifest_created"] is False
-        assert state["directories_created"] is False
-        assert state["resume_step"] == 1
+        assert state.interview_complete is False
+        assert state.manifest_created is False
+        assert state.directories_created is False
+        assert state.resume_step == 1
 
     def test_interview_complete_from_file(self, tmp_path):
         """Interview file exists should return resume_step=2."""
@@ -78,9 +88,9 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["interview_complete"] is True
-        assert state["manifest_created"] is False
-        assert state["resume_step"] == 2
+        assert state.interview_complete is True
+        assert state.manifest_created is False
+        assert state.resume_step == 2
 
     def test_manifest_created_no_directories(self, tmp_path):
         """Manifest exists but no directories should return resume_step=4."""
@@ -89,10 +99,10 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["interview_complete"] is True
-        assert state["manifest_created"] is True
-        assert state["directories_created"] is False
-        assert state["resume_step"] == 4  # User confirmation
+        assert state.interview_complete is True
+        assert state.manifest_created is True
+        assert state.directories_created is False
+        assert state.resume_step == 4  # User confirmation
 
     def test_directories_created(self, tmp_path):
         """Dirs without specs should return resume_step=6."""
@@ -102,9 +112,9 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["directories_created"] is True
-        assert state["splits"] == ["01-backend", "02-frontend"]
-        assert state["resume_step"] == 6  # Spec generation
+        assert state.directories_created is True
+        assert state.splits == ("01-backend", "02-frontend")
+        assert state.resume_step == 6  # Spec generation
 
     def test_partial_specs(self, tmp_path):
         """Some specs missing should return resume_step=6."""
@@ -115,8 +125,8 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["splits_with_specs"] == ["01-backend"]
-        assert state["resume_step"] == 6  # Still in spec generation
+        assert state.splits_with_specs == ("01-backend",)
+        assert state.resume_step == 6  # Still in spec generation
 
     def test_all_specs_complete(self, tmp_path):
         """All specs written should return resume_step=7."""
@@ -126,8 +136,8 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["splits_with_specs"] == ["01-backend"]
-        assert state["resume_step"] == 7  # Complete
+        assert state.splits_with_specs == ("01-backend",)
+        assert state.resume_step == 7  # Complete
 
     def test_multiple_splits_complete(self, tmp_path):
         """Multiple splits all with specs."""
@@ -139,9 +149,9 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["splits"] == ["01-backend", "02-frontend"]
-        assert state["splits_with_specs"] == ["01-backend", "02-frontend"]
-        assert state["resume_step"] == 7
+        assert state.splits == ("01-backend", "02-frontend")
+        assert state.splits_with_specs == ("01-backend", "02-frontend")
+        assert state.resume_step == 7
 
     def test_ignores_invalid_directories(self, tmp_path):
         """Should ignore dirs not matching pattern."""
@@ -152,7 +162,7 @@ class TestDetectState:
 
         state = detect_state(tmp_path)
 
-        assert state["splits"] == ["01-backend"]
+        assert state.splits == ("01-backend",)
 
     def test_handles_old_format_session_json(self, tmp_path):
         """Should handle old session.json format - state derived from files only."""
@@ -178,9 +188,56 @@ class TestDetectState:
         state = detect_state(tmp_path)
 
         # State is derived from files, not JSON fields
-        assert state["interview_complete"] is True  # From file existence
-        assert state["directories_created"] is True  # From directory existence
-        assert state["resume_step"] == 7
+        assert state.interview_complete is True  # From file existence
+        assert state.directories_created is True  # From directory existence
+        assert state.resume_step == 7
+
+    def test_reuses_result_when_dirs_unchanged(self, tmp_path, monkeypatch):
+        """Should not rescan when planning and split dir mtimes are unchanged."""
+        (tmp_path / "01-backend").mkdir()
+        for d in (tmp_path / "01-backend", tmp_path):
+            os.utime(d, ns=(1_000_000_000, 1_000_000_000))
+        first = detect_state(tmp_path)
+
+        def fail_scan(planning_dir):
+            raise AssertionError("planning dir was rescanned")
+
+        monkeypatch.setattr("lib.state._detect_state_uncached", fail_scan)
+        assert detect_state(tmp_path) == first
+
+    def test_new_spec_invalidates_cached_result(self, tmp_path):
+        """Writing spec.md into a split dir should be picked up."""
+        (tmp_path / "01-backend").mkdir()
+        for d in (tmp_path / "01-backend", tmp_path):
+            os.utime(d, ns=(1_000_000_000, 1_000_000_000))
+        assert detect_state(tmp_path).resume_step == 6
+
+        (tmp_path / "01-backend" / "spec.md").write_text("# Spec")
+
+        assert detect_state(tmp_path).resume_step == 7
+
+    def test_result_is_immutable(self, tmp_path):
+        """Cached results are shared, so they must not be mutable."""
+        (tmp_path / "01-backend").mkdir()
+        state = detect_state(tmp_path)
+
+        with pytest.raises(FrozenInstanceError):
+            state.resume_step = 1
+        assert isinstance(state.splits, tuple)
+
+    def test_to_dict_is_json_ready(self, tmp_path):
+        """to_dict should expose all fields with list values."""
+        (tmp_path / "01-backend").mkdir()
+        (tmp_path / "01-backend" / "spec.md").write_text("# Spec")
+
+        assert detect_state(tmp_path).to_dict() == {
+            "interview_complete": False,
+            "manifest_created": False,
+            "directories_created": True,
+            "splits": ["01-backend"],
+            "splits_with_specs": ["01-backend"],
+            "resume_step": 7,
+        }
 
 
 class TestGenerateTodos:
@@ -293,10 +350,10 @@ class TestResumeStepTodoConsistency:
     def test_fresh_state_todos_match_step_1(self, tmp_path):
         """Empty dir: resume_step=1, TODOs should mark step 1 in_progress."""
         state = detect_state(tmp_path)
-        assert state["resume_step"] == 1
+        assert state.resume_step == 1
 
         todos = generate_todos(
-            current_step=state["resume_step"],
+            current_step=state.resume_step,
             plugin_root="/plugin",
             planning_dir=str(tmp_path),
             initial_file=str(tmp_path / "spec.md")
@@ -309,10 +366,10 @@ class TestResumeStepTodoConsistency:
         (tmp_path / "deep_project_interview.md").write_text("# Interview")
 
         state = detect_state(tmp_path)
-        assert state["resume_step"] == 2
+        assert state.resume_step == 2
 
         todos = generate_todos(
-            current_step=state["resume_step"],
+            current_step=state.resume_step,
             plugin_root="/plugin",
             planning_dir=str(tmp_path),
             initial_file=str(tmp_path / "spec.md")
@@ -326,10 +383,10 @@ class TestResumeStepTodoConsistency:
         (tmp_path / "project-manifest.md").write_text("# Manifest proposal")
 
         state = detect_state(tmp_path)
-        assert state["resume_step"] == 4
+        assert state.resume_step == 4
 
         todos = generate_todos(
-            current_step=state["resume_step"],
+            current_step=state.resume_step,
             plugin_root="/plugin",
             planning_dir=str(tmp_path),
             initial_file=str(tmp_path / "spec.md")
@@ -343,10 +400,10 @@ class TestResumeStepTodoConsistency:
         (tmp_path / "01-backend").mkdir()
 
         state = detect_state(tmp_path)
-        assert state["resume_step"] == 6
+        assert state.resume_step == 6
 
         todos = generate_todos(
-            current_step=state["resume_step"],
+            current_step=state.resume_step,
             plugin_root="/plugin",
             planning_dir=str(tmp_path),
             initial_file=str(tmp_path / "spec.md")
@@ -362,10 +419,10 @@ class TestResumeStepTodoConsistency:
         (tmp_path / "02-frontend").mkdir()  # No spec yet
 
         state = detect_state(tmp_path)
-        assert state["resume_step"] == 6
+        assert state.resume_step == 6
 
         todos = generate_todos(
-            current_step=state["resume_step"],
+            current_step=state.resume_step,
             plugin_root="/plugin",
             planning_dir=str(tmp_path),
             initial_file=str(tmp_path / "spec.md")
@@ -380,10 +437,10 @@ class TestResumeStepTodoConsistency:
         (tmp_path / "01-backend" / "spec.md").write_text("# Spec")
 
         state = detect_state(tmp_path)
-        assert state["resume_step"] == 7
+        assert state.resume_step == 7
 
         todos = generate_todos(
-            current_step=state["resume_step"],
+            current_step=state.resume_step,
             plugin_root="/plugin",
             planning_dir=str(tmp_path),
             initial_file=str(tmp_path / "spec.md")
@@ -402,23 +459,23 @@ class TestResumeStepTodoConsistency:
         test_states = []
 
         # Fresh state
-        test_states.append(detect_state(tmp_path)["resume_step"])
+        test_states.append(detect_state(tmp_path).resume_step)
 
         # Interview complete
         (tmp_path / "deep_project_interview.md").write_text("# Interview")
-        test_states.append(detect_state(tmp_path)["resume_step"])
+        test_states.append(detect_state(tmp_path).resume_step)
 
         # Manifest created (proposal complete)
         (tmp_path / "project-manifest.md").write_text("# Manifest proposal")
-        test_states.append(detect_state(tmp_path)["resume_step"])
+        test_states.append(detect_state(tmp_path).resume_step)
 
         # Directories created (user confirmed)
         (tmp_path / "01-backend").mkdir()
-        test_states.append(detect_state(tmp_path)["resume_step"])
+        test_states.append(detect_state(tmp_path).resume_step)
 
         # Specs written (complete)
         (tmp_path / "01-backend" / "spec.md").write_text("# Spec")
-        test_states.append(detect_state(tmp_path)["resume_step"])
+        test_states.append(detect_state(tmp_path).resume_step)
 
         # Verify steps 3 and 5 are never returned
         assert 3 not in test_states, "Step 3 should never be a valid resume point"
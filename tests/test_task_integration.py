@@ -6,13 +6,11 @@ through to task file verification.
 
 import json
 import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-
 from lib.config import compute_file_hash, save_session_state
 from lib.task_storage import get_tasks_dir
 
@@ -26,7 +24,7 @@ def run_setup_session(
 ) -> dict:
     """Helper to run setup-session.py and return parsed output."""
     cmd = [
-        "uv", "run", "scripts/checks/setup-session.py",
+        sys.executable, "scripts/checks/setup-session.py",
         "--file", str(input_file),
         "--plugin-root", str(plugin_root),
         "--session-id", session_id,
@@ -44,7 +42,6 @@ def run_setup_session(
     result = subprocess.run(
         cmd,
         capture_output=True,
-        text=True,
         cwd=Path(__file__).parent.parent,
         env=env,
     )
@@ -308,7 +305,7 @@ class TestConflictHandling:
 
         # Run with CLAUDE_CODE_TASK_LIST_ID set
         cmd = [
-            "uv", "run", "scripts/checks/setup-session.py",
+            sys.executable, "scripts/checks/setup-session.py",
             "--file", str(env["input_file"]),
             "--plugin-root", str(env["plugin_root"]),
             # Note: NOT passing --session-id, so it falls back to env
@@ -321,7 +318,6 @@ class TestConflictHandling:
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent,
             env=run_env,
         )
@@ -352,7 +348,7 @@ class TestConflictHandling:
 
         # Run with --force
         cmd = [
-            "uv", "run", "scripts/checks/setup-session.py",
+            sys.executable, "scripts/checks/setup-session.py",
             "--file", str(env["input_file"]),
             "--plugin-root", str(env["plugin_root"]),
             "--force",
@@ -365,7 +361,6 @@ class TestConflictHandling:
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
             cwd=Path(__file__).parent.parent,
             env=run_env,
         )
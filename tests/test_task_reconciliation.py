@@ -1,12 +1,7 @@
 """Tests for task_reconciliation.py module."""
 
-from pathlib import Path
-
 import pytest
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-
 from lib.task_reconciliation import TaskListContext, TaskListSource
 
 
@@ -107,3 +102,22 @@ class TestTaskListContext:
         assert ctx.source == TaskListSource.CONTEXT
         # When using context, is_user_specified is False
         assert ctx.is_user_specified is False
+
+    def test_repeated_calls_reuse_context(self, monkeypatch):
+        """Same arg and env should return the cached context."""
+        monkeypatch.setenv("DEEP_SESSION_ID", "env-session")
+        monkeypatch.delenv("CLAUDE_CODE_TASK_LIST_ID", raising=False)
+
+        first = TaskListContext.from_args_and_env()
+
+        assert TaskListContext.from_args_and_env() is first
+
+    def test_env_change_resolves_again(self, monkeypatch):
+        """Changing an env var should not return a stale cached context."""
+        monkeypatch.setenv("DEEP_SESSION_ID", "old-session")
+        monkeypatch.delenv("CLAUDE_CODE_TASK_LIST_ID", raising=False)
+        TaskListContext.from_args_and_env()
+
+        monkeypatch.setenv("DEEP_SESSION_ID", "new-session")
+
+        assert TaskListContext.from_args_and_env().task_list_id == "new-session"
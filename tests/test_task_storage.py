@@ -1,18 +1,18 @@
 """Tests for task_storage.py module."""
 
 import json
+import os
+import shutil
 from pathlib import Path
 
 import pytest
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-
 from lib.task_storage import (
     TaskStatus,
     TaskToWrite,
     TaskWriteResult,
     get_tasks_dir,
+    position_id,
     write_tasks,
 )
 
@@ -46,8 +46,8 @@ class TestTaskToWrite:
         assert result["status"] == "pending"
         assert result["description"] == ""
         assert result["activeForm"] == ""
-        assert result["blocks"] == []
-        assert result["blockedBy"] == []
+        assert result["blocks"] == ()
+        assert result["blockedBy"] == ()
 
     def test_to_file_dict_full(self):
         task = TaskToWrite(
@@ -66,8 +66,17 @@ class TestTaskToWrite:
         assert result["status"] == "in_progress"
         assert result["description"] == "A detailed description"
         assert result["activeForm"] == "Running task"
-        assert result["blocks"] == ["6", "7"]
-        assert result["blockedBy"] == ["3", "4"]
+        assert result["blocks"] == ("6", "7")
+        assert result["blockedBy"] == ("3", "4")
+
+
+class TestPositionId:
+    """Tests for position_id helper."""
+
+    def test_returns_shared_string(self):
+        """Should return the decimal string, the same object on every call."""
+        assert position_id(12) == "12"
+        assert position_id(12) is position_id(12)
 
 
 class TestTaskWriteResult:
@@ -105,6 +114,12 @@ class TestGetTasksDir:
         result2 = get_tasks_dir("session-2")
         assert result1 != result2
 
+    def test_resolves_home_once(self, tmp_path, monkeypatch):
+        """Should keep using the first resolved home directory."""
+        first = get_tasks_dir("session-1")
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        assert get_tasks_dir("session-1") == first
+
 
 class TestWriteTasks:
     """Tests for write_tasks function."""
@@ -204,6 +219,35 @@ class TestWriteTasks:
             assert data["subject"] == "[obsolete]"
             assert data["status"] == "completed"
 
+    def test_obsolete_file_keeps_other_fields(self, tmp_path, monkeypatch):
+        """Marking obsolete should only change subject and status."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+        tasks_dir = tmp_path / ".claude" / "tasks" / "session-123"
+        tasks_dir.mkdir(parents=True)
+        (tasks_dir / "3.json").write_text(json.dumps({
+            "id": "3",
+            "subject": "Old task",
+            "description": "Old description",
+            "status": "pending",
+            "blockedBy": ["2"],
+            "owner": "someone",
+        }))
+
+        task = TaskToWrite(position=1, subject="Task 1", status=TaskStatus.PENDING)
+        write_tasks("session-123", [task])
+
+        data = json.loads((tasks_dir / "3.json").read_text())
+        assert data == {
+            "id": "3",
+            "subject": "[obsolete]",
+            "description": "Old description",
+            "status": "completed",
+            "blocks": [],
+            "blockedBy": ["2"],
+            "owner": "someone",
+        }
+
     def test_skips_already_obsolete(self, tmp_path, monkeypatch):
         """Should not re-mark tasks that are already obsolete."""
         monkeypatch.setattr(Path, "home", lambda: tmp_path)
@@ -228,6 +272,26 @@ class TestWriteTasks:
         data = json.loads((tasks_dir / "3.json").read_text())
         assert data["subject"] == "[obsolete]"
 
+    def test_skips_obsolete_without_decoding(self, tmp_path, monkeypatch):
+        """Files already marked obsolete should not be JSON-decoded again."""
+        from lib import task_storage
+
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        tasks = [
+            TaskToWrite(position=1, subject="Task 1", status=TaskStatus.PENDING),
+            TaskToWrite(position=2, subject="Task 2", status=TaskStatus.PENDING),
+        ]
+        write_tasks("session-123", tasks)
+        write_tasks("session-123", tasks[:1])  # Marks 2.json obsolete
+
+        def fail_loads(*args, **kwargs):
+            raise AssertionError("obsolete file was decoded")
+
+        monkeypatch.setattr(task_storage.json, "loads", fail_loads)
+        result = write_tasks("session-123", tasks[:1])
+
+        assert result.success is True
+
     def test_creates_directory(self, tmp_path, monkeypatch):
         """Should create tasks directory if it doesn't exist."""
         monkeypatch.setattr(Path, "home", lambda: tmp_path)
@@ -239,6 +303,19 @@ class TestWriteTasks:
         tasks_dir = tmp_path / ".claude" / "tasks" / "session-123"
         assert tasks_dir.exists()
 
+    def test_recreates_removed_directory(self, tmp_path, monkeypatch):
+        """A tasks dir removed between batches should be created again."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        task = TaskToWrite(position=1, subject="Task 1", status=TaskStatus.PENDING)
+        write_tasks("session-123", [task])
+
+        tasks_dir = tmp_path / ".claude" / "tasks" / "session-123"
+        shutil.rmtree(tasks_dir)
+        result = write_tasks("session-123", [task])
+
+        assert result.success is True
+        assert (tasks_dir / "1.json").exists()
+
     def test_returns_error_on_missing_task_list_id(self):
         """Should return error when task_list_id is empty."""
         task = TaskToWrite(position=1, subject="Task", status=TaskStatus.PENDING)
@@ -273,3 +350,92 @@ class TestWriteTasks:
         data2 = json.loads((tasks_dir / "2.json").read_text())
         assert data2["blocks"] == []
         assert data2["blockedBy"] == ["1"]
+
+    def test_leaves_no_temp_files(self, tmp_path, monkeypatch):
+        """Writes go through temp files that are renamed into place."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+        tasks = [
+            TaskToWrite(position=i, subject=f"Task {i}", status=TaskStatus.PENDING)
+            for i in (1, 2, 3)
+        ]
+        write_tasks("session-123", tasks)
+
+        tasks_dir = tmp_path / ".claude" / "tasks" / "session-123"
+        assert sorted(p.name for p in tasks_dir.iterdir()) == ["1.json", "2.json", "3.json"]
+
+    def test_interleaved_writers_of_same_task(self, tmp_path, monkeypatch):
+        """A second writer landing mid-rename should not break the first."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        real_replace = os.replace
+        inner_results = []
+
+        # Run a whole second write of the same task file just before the
+        # first writer's rename, as a concurrent setup-session run could
+        def replace_after_other_writer(src, dst):
+            monkeypatch.setattr(os, "replace", real_replace)
+            other = TaskToWrite(position=1, subject="Inner", status=TaskStatus.PENDING)
+            inner_results.append(write_tasks("session-123", [other]))
+            real_replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", replace_after_other_writer)
+        task = TaskToWrite(position=1, subject="Outer", status=TaskStatus.PENDING)
+        result = write_tasks("session-123", [task])
+
+        assert result.success is True
+        assert inner_results[0].success is True
+        tasks_dir = tmp_path / ".claude" / "tasks" / "session-123"
+        assert json.loads((tasks_dir / "1.json").read_bytes())["subject"] == "Outer"
+        assert [p.name for p in tasks_dir.iterdir()] == ["1.json"]
+
+    def test_task_files_use_umask_mode(self, tmp_path, monkeypatch):
+        """Task files should get the umask default mode, not mkstemp's 0600."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        umask = os.umask(0)
+        os.umask(umask)
+
+        task = TaskToWrite(position=1, subject="Task 1", status=TaskStatus.PENDING)
+        write_tasks("session-123", [task])
+
+        task_file = tmp_path / ".claude" / "tasks" / "session-123" / "1.json"
+        assert task_file.stat().st_mode & 0o777 == 0o666 & ~umask
+
+    def test_fsyncs_once_per_batch(self, tmp_path, monkeypatch):
+        """Only the tasks directory should be fsynced, not each task file."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        monkeypatch.setattr("lib.config.FSYNC_ENABLED", True)
+        monkeypatch.setattr("lib.task_storage.FSYNC_ENABLED", True)
+        calls = []
+        monkeypatch.setattr(os, "fsync", calls.append)
+
+        tasks = [
+            TaskToWrite(position=i, subject=f"Task {i}", status=TaskStatus.PENDING)
+            for i in (1, 2, 3)
+        ]
+        write_tasks("session-123", tasks)
+
+        assert len(calls) == 1
+
+    def test_skips_unchanged_task_files(self, tmp_path, monkeypatch):
+        """Rewriting identical tasks should leave the files untouched."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        task = TaskToWrite(position=1, subject="Task 1", status=TaskStatus.PENDING)
+        write_tasks("session-123", [task])
+
+        task_file = tmp_path / ".claude" / "tasks" / "session-123" / "1.json"
+        inode = task_file.stat().st_ino
+
+        write_tasks("session-123", [task])
+
+        assert task_file.stat().st_ino == inode
+
+    def test_writes_compact_json(self, tmp_path, monkeypatch):
+        """Task files should be written without indentation."""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        task = TaskToWrite(position=1, subject="Task 1", status=TaskStatus.PENDING)
+        write_tasks("session-123", [task])
+
+        raw = (tmp_path / ".claude" / "tasks" / "session-123" / "1.json").read_bytes()
+        assert b"\n" not in raw
+        assert raw.startswith(b'{"id":"1","subject":"Task 1"')
+        assert raw.endswith(b'"blocks":[],"blockedBy":[]}')
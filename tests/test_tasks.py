@@ -1,15 +1,11 @@
 """Tests for tasks.py module."""
 
-from pathlib import Path
-
 import pytest
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-
 from lib.task_storage import TaskStatus, TaskToWrite
 from lib.tasks import (
     CONTEXT_TASK_IDS,
+    SEMANTIC_TO_POSITION,
     TASK_DEFINITIONS,
     TASK_DEPENDENCIES,
     TASK_IDS,
@@ -81,6 +77,10 @@ class TestBuildSemanticToPositionMap:
         min_pos = min(mapping.values())
         assert min_pos == 10
 
+    def test_module_constant_matches_default_map(self):
+        """SEMANTIC_TO_POSITION should equal the default-start mapping."""
+        assert SEMANTIC_TO_POSITION == build_semantic_to_position_map()
+
 
 class TestBuildDependencyGraph:
     """Tests for build_dependency_graph function."""
@@ -241,3 +241,37 @@ class TestGenerateExpectedTasks:
 
         for ctx_task in context_tasks:
             assert output_summary_pos in ctx_task.blocked_by
+
+    def test_repeated_calls_share_result(self):
+        """Identical arguments should return the same cached tuple."""
+        args = dict(
+            current_step=2,
+            plugin_root="/path/to/plugin",
+            planning_dir="/path/to/planning",
+            initial_file="/path/to/file.md",
+        )
+
+        first = generate_expected_tasks(**args)
+
+        assert isinstance(first, tuple)
+        assert generate_expected_tasks(**args) is first
+        assert generate_expected_tasks(**{**args, "current_step": 3}) is not first
+
+    def test_pending_tasks_reuse_templates(self):
+        """Pending workflow tasks should be shared between different calls."""
+        first = generate_expected_tasks(
+            current_step=1,
+            plugin_root="/path/to/plugin",
+            planning_dir="/path/to/planning",
+            initial_file="/path/to/file.md",
+        )
+        second = generate_expected_tasks(
+            current_step=2,
+            plugin_root="/other/plugin",
+            planning_dir="/other/planning",
+            initial_file="/other/file.md",
+        )
+
+        # Position 8 is output-summary, pending in both
+        assert first[7] is second[7]
+        assert first[7].status == TaskStatus.PENDING